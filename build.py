@@ -1,14 +1,23 @@
 import json
 import re
+import io
 import pprint
 import os
 import subprocess
 import shutil
 from sys import platform
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 import time
 
+# optional, faster drop-in for json.loads() on the (large) api.json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # dict that keeps the order of insertion
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict, deque, namedtuple
 
 def create_folder(path):
     os.mkdir(path)
@@ -28,41 +37,69 @@ def zip_directory(output_filename, dir_name):
 def copy_file(src, dest):
     shutil.copyfile(src, dest)
 
+# patch files (header.rs, ...) are read by several generators, only read them once
+@lru_cache(maxsize=None)
 def read_file(path):
-    text_file = open(path, 'r')
-    text_file_contents = text_file.read()
-    text_file.close()
-    return text_file_contents
+    with open(path, 'rb') as text_file:
+        contents = text_file.read().decode('utf-8')
+    # same newline handling as text mode (some examples / guides use "\r\n")
+    if "\r" in contents:
+        contents = contents.replace("\r\n", "\n").replace("\r", "\n")
+    return contents
 
 def read_api_file(path):
-    api_file_contents = read_file(path)
-    apiData = json.loads(api_file_contents)
+    # both json and orjson parse bytes directly, no need to decode first
+    with open(path, 'rb') as api_file:
+        api_file_contents = api_file.read()
+    if orjson is not None:
+        apiData = orjson.loads(api_file_contents)
+    else:
+        apiData = json.loads(api_file_contents)
     return apiData
 
 html_root = "https://azul.rs"
 root_folder = os.path.abspath(os.path.join(__file__, os.pardir))
 prefix = "Az"
-basic_types = [ # note: "char" is not a primitive type! - use u32 instead
+basic_types = frozenset([ # note: "char" is not a primitive type! - use u32 instead
     "bool", "f32", "f64", "fn", "i128", "i16",
     "i32", "i64", "i8", "isize", "slice", "u128", "u16",
     "u32", "u64", "u8", "()", "usize", "c_void"
-]
-
-license = read_file(root_folder + "/LICENSE")
+])
+# strips "<mail@example.com>" from the cargo-license author list
+author_email_regex = re.compile("<.*>")
 
+# patch files for the Rust API, only read (once) when a generator asks for them
 rust_api_patches = {
-    tuple(['str']): read_file(root_folder + "/api/_patches/azul.rs/string.rs"),
-    tuple(['vec']): read_file(root_folder + "/api/_patches/azul.rs/vec.rs"),
-    tuple(['option']): read_file(root_folder + "/api/_patches/azul.rs/option.rs"),
-    tuple(['dom']): read_file(root_folder + "/api/_patches/azul.rs/dom.rs"),
-    tuple(['gl']): read_file(root_folder + "/api/_patches/azul.rs/gl.rs"),
-    tuple(['css']): read_file(root_folder + "/api/_patches/azul.rs/css.rs"),
-    tuple(['window']): read_file(root_folder + "/api/_patches/azul.rs/window.rs"),
-    tuple(['callbacks']): read_file(root_folder + "/api/_patches/azul.rs/callbacks.rs"),
+    ('str',): root_folder + "/api/_patches/azul.rs/string.rs",
+    ('vec',): root_folder + "/api/_patches/azul.rs/vec.rs",
+    ('option',): root_folder + "/api/_patches/azul.rs/option.rs",
+    ('dom',): root_folder + "/api/_patches/azul.rs/dom.rs",
+    ('gl',): root_folder + "/api/_patches/azul.rs/gl.rs",
+    ('css',): root_folder + "/api/_patches/azul.rs/css.rs",
+    ('window',): root_folder + "/api/_patches/azul.rs/window.rs",
+    ('callbacks',): root_folder + "/api/_patches/azul.rs/callbacks.rs",
+}
+
+def get_rust_api_patch(key):
+    return read_file(rust_api_patches[key])
+
+# trait impls for classes that wrap an external (boxed) type, filled in with str.format_map()
+# rust api: {name} = class name, {ptr_name} = prefixed class name (name of the dll functions)
+rust_api_impl_templates = {
+    "Clone": "    impl Clone for {name} {{ fn clone(&self) -> Self {{ unsafe {{ crate::dll::{ptr_name}_deepCopy(self) }} }} }}\r\n",
+    "Drop": "    impl Drop for {name} {{ fn drop(&mut self) {{ if self.run_destructor {{ unsafe {{ crate::dll::{ptr_name}_delete(self) }} }} }} }}\r\n",
+}
+# python api: {name} = python type name (+ "EnumWrapper" for enums), {ptr_name} = struct name,
+# {external} = the wrapped Rust type
+python_impl_templates = {
+    "Clone": "impl Clone for {name} {{ fn clone(&self) -> Self {{ let r: &{external} = unsafe {{ mem::transmute(self) }}; unsafe {{ mem::transmute(r.clone()) }} }} }}\r\n",
+    "Drop": "impl Drop for {name} {{ fn drop(&mut self) {{ crate::{ptr_name}_delete(unsafe {{ mem::transmute(self) }}); }} }}\r\n",
 }
 
 # ---------------------------------------------------------------------------------------------
 
+# called for every exported function by each generator, with the same names
+@lru_cache(maxsize=None)
 def snake_case_to_lower_camel(snake_str):
     first, *others = snake_str.split('_')
     return ''.join([first.lower(), *map(str.title, others)])
@@ -71,14 +108,7 @@ def strip_fn_arg_types_mem_transmute(arg_list):
     if len(arg_list) == 0:
         return ""
 
-    arg_list1 = ""
-
-    for item in arg_list.split(","):
-        part_a = item.split(":")[0].strip()
-        arg_list1 += "transmute(" + part_a + "), "
-
-    if arg_list1 != "":
-        arg_list1 = arg_list1[:-2]
+    arg_list1 = ", ".join(["transmute(" + item.partition(":")[0].strip() + ")" for item in arg_list.split(",")])
 
     return arg_list1.strip()
 
@@ -89,41 +119,34 @@ def strip_fn_arg_types(arg_list):
     if len(arg_list) == 0:
         return ""
 
-    arg_list1 = ""
-
+    stripped_args = []
     for item in arg_list.split(","):
-        part_b = item.split(":")[1]
-        arg_list1 += "_: " + part_b + ", "
+        _, separator, arg_type = item.partition(":")
+        if separator == "":
+            raise Exception("strip_fn_arg_types: missing \":\" in fn_args \"" + arg_list + "\"")
+        stripped_args.append("_: " + arg_type)
 
-    if arg_list1 != "":
-        arg_list1 = arg_list1[:-2]
-
-    return arg_list1.strip()
+    return ", ".join(stripped_args).strip()
 
 def write_file(string, path):
-    text_file = open(path, "w+", newline='')
-    text_file.write(string)
-    text_file.close()
+    with open(path, 'wb', buffering=1<<20) as text_file:
+        text_file.write(string.encode('utf-8'))
 
+# called for every argument / field type, the same type strings repeat a lot
+@lru_cache(maxsize=None)
 def is_primitive_arg(arg):
     return get_stripped_arg(arg) in basic_types
 
 def get_stripped_arg(arg):
-    arg = arg.replace("&", "")
-    arg = arg.replace("&mut", "")
-    arg = arg.replace("*const", "")
-    arg = arg.replace("*const", "")
-    arg = arg.replace("*mut", "")
-    arg = arg.strip()
-    return arg
+    return arg.replace("&", "").replace("*const", "").replace("*mut", "").strip()
 
 def search_imports_arg_type(c, search_type, arg_types_to_search):
-    if search_type in c.keys():
+    if search_type in c:
         for fn_name in c[search_type]:
             const = c[search_type][fn_name]
-            if "fn_args" in const.keys():
+            if "fn_args" in const:
                 for arg_object in const["fn_args"]:
-                    arg_name = list(arg_object.keys())[0]
+                    arg_name = next(iter(arg_object))
                     if arg_name == "self":
                         continue
                     arg_type = arg_object[arg_name]
@@ -131,11 +154,11 @@ def search_imports_arg_type(c, search_type, arg_types_to_search):
 
 def get_all_imports(apiData, module, module_name):
 
-    imports = {}
+    imports = defaultdict(set)
 
     arg_types_to_search = []
 
-    for class_name in module.keys():
+    for class_name in module:
         c = module[class_name]
         search_imports_arg_type(c, "constructors", arg_types_to_search)
         search_imports_arg_type(c, "functions", arg_types_to_search)
@@ -154,52 +177,43 @@ def get_all_imports(apiData, module, module_name):
         if found_module is None:
             raise Exception(arg + " not found!")
 
-        if found_module[0] in imports:
-            imports[found_module[0]].add(found_module[1])
-        else:
-            imports[found_module[0]] = {found_module[1]}
+        imports[found_module[0]].add(found_module[1])
 
     if module_name in imports:
         del imports[module_name]
 
-    imports_str = ""
+    imports_str = []
 
-    for module_name in imports.keys():
-        classes = list(imports[module_name])
-        use_str = ""
+    for module_name in imports:
+        classes = imports[module_name]
         if len(classes) == 1:
-            use_str = classes[0]
+            use_str = next(iter(classes))
         else:
-            use_str = "{"
-            classes.sort()
-            for c in classes:
-                use_str += c + ", "
-            use_str = use_str[:-2]
-            use_str += "}"
+            use_str = "{" + ", ".join(sorted(classes)) + "}"
 
-        imports_str += "    use crate::" + module_name + "::" + use_str + ";\r\n"
+        imports_str.append(f"    use crate::{module_name}::{use_str};\r\n")
 
-    return imports_str
+    return "".join(imports_str)
 
 def fn_args_c_api(f, class_name, class_ptr_name, self_as_first_arg, apiData):
-    fn_args = ""
+    fn_args = []
 
     if self_as_first_arg:
-        self_val = list(f["fn_args"][0].values())[0]
+        self_val = next(iter(f["fn_args"][0].values()))
         if (self_val == "value"):
-            fn_args += class_name.lower() + ": " + class_ptr_name + ", "
+            fn_args.append(class_name.lower() + ": " + class_ptr_name)
         elif (self_val == "mut value"):
-            fn_args += "mut " + class_name.lower() + ": " + class_ptr_name + ", "
+            fn_args.append("mut " + class_name.lower() + ": " + class_ptr_name)
         elif (self_val == "refmut"):
-            fn_args += class_name.lower() + ": &mut " + class_ptr_name + ", "
+            fn_args.append(class_name.lower() + ": &mut " + class_ptr_name)
         elif (self_val == "ref"):
-            fn_args += class_name.lower() + ": &" + class_ptr_name + ", "
+            fn_args.append(class_name.lower() + ": &" + class_ptr_name)
         else:
             raise Exception("wrong self value " + self_val + " " + class_name)
 
-    if "fn_args" in f.keys():
+    if "fn_args" in f:
         for arg_object in f["fn_args"]:
-            arg_name = list(arg_object.keys())[0]
+            arg_name = next(iter(arg_object))
             if arg_name == "self":
                 continue
             arg_type = arg_object[arg_name]
@@ -209,37 +223,36 @@ def fn_args_c_api(f, class_name, class_ptr_name, self_as_first_arg, apiData):
             arg_type = analyzed_arg_type[1]
 
             if is_primitive_arg(arg_type):
-                fn_args += arg_name + ": " + ptr_type + arg_type + ", " # no pre, no postfix
+                fn_args.append(arg_name + ": " + ptr_type + arg_type) # no pre, no postfix
             else:
                 arg_type_new = search_for_class_by_class_name(apiData, arg_type)
                 if arg_type_new is None:
                     print("arg_type not found: " + str(arg_type))
                     raise Exception("type not found: " + arg_type)
                 arg_type = arg_type_new[1]
-                fn_args += arg_name + ": " + ptr_type + prefix + arg_type + ", " # no postfix
-        fn_args = fn_args[:-2]
+                fn_args.append(arg_name + ": " + ptr_type + prefix + arg_type) # no postfix
 
-    return fn_args
+    return ", ".join(fn_args)
 
 def c_fn_args_c_api(f, class_name, class_ptr_name, self_as_first_arg):
-    fn_args = ""
+    fn_args = []
 
     if self_as_first_arg:
-        self_val = list(f["fn_args"][0].values())[0]
+        self_val = next(iter(f["fn_args"][0].values()))
         if (self_val == "value"):
-            fn_args += "const " + class_ptr_name + " " + class_name.lower() + ", "
+            fn_args.append("const " + class_ptr_name + " " + class_name.lower())
         elif (self_val == "mut value"):
-            fn_args += "restrict " + class_ptr_name + ": " + class_name.lower() + ", "
+            fn_args.append("restrict " + class_ptr_name + ": " + class_name.lower())
         elif (self_val == "refmut"):
-            fn_args += class_ptr_name + "* restrict " + class_name.lower() + ", "
+            fn_args.append(class_ptr_name + "* restrict " + class_name.lower())
         elif (self_val == "ref"):
-            fn_args += "const " + class_ptr_name + "* " + class_name.lower() + ", "
+            fn_args.append("const " + class_ptr_name + "* " + class_name.lower())
         else:
             raise Exception("wrong self value " + self_val)
 
-    if "fn_args" in f.keys():
+    if "fn_args" in f:
         for arg_object in f["fn_args"]:
-            arg_name = list(arg_object.keys())[0]
+            arg_name = next(iter(arg_object))
             if arg_name == "self":
                 continue
             arg_type = arg_object[arg_name]
@@ -250,134 +263,163 @@ def c_fn_args_c_api(f, class_name, class_ptr_name, self_as_first_arg):
 
             if is_primitive_arg(arg_type):
                 if ptr_type == "*const":
-                    fn_args += "const" + replace_primitive_ctype(arg_type) + "* " + arg_name + ", " # no pre, no postfix
+                    fn_args.append("const" + replace_primitive_ctype(arg_type) + "* " + arg_name) # no pre, no postfix
                 elif ptr_type == "*mut":
-                    fn_args += replace_primitive_ctype(arg_type) + "* restrict" + " " + arg_name + ", " # no pre, no postfix
+                    fn_args.append(replace_primitive_ctype(arg_type) + "* restrict" + " " + arg_name) # no pre, no postfix
                 else:
-                    fn_args += replace_primitive_ctype(arg_type) + " " + arg_name + ", " # no pre, no postfix
+                    fn_args.append(replace_primitive_ctype(arg_type) + " " + arg_name) # no pre, no postfix
             else:
-                fn_args += prefix + replace_primitive_ctype(arg_type) + replace_primitive_ctype(ptr_type).strip() + " " + arg_name + ", " # no postfix
+                fn_args.append(prefix + replace_primitive_ctype(arg_type) + replace_primitive_ctype(ptr_type).strip() + " " + arg_name) # no postfix
 
-        fn_args = fn_args[:-2]
+    return ", ".join(fn_args)
 
-    return fn_args
+# pointer / reference prefixes, longest first ("&mut" before "&")
+analyze_type_prefixes = (
+    ("&mut", "&mut "),
+    ("&", "&"),
+    ("*const", "*const "),
+    ("*mut", "*mut "),
+)
 
+# Splits a type into [prefix, type, postfix], i.e.:
+#
+# analyze_type("*const [PixelValue;2]")
+# => ["*const [", "PixelValue", ";2]"]
 def analyze_type(arg):
-    starts = ""
-    arg_type = ""
-    ends = ""
 
     if type(arg) is dict:
         print("expected string, got dict: " + str(arg))
 
-    if arg.startswith("&mut"):
-        starts = "&mut "
-        arg_type = arg.replace("&mut", "")
-    elif arg.startswith("&"):
-        starts = "&"
-        arg_type = arg.replace("&", "")
-    elif arg.startswith("*const"):
-        starts = "*const "
-        arg_type = arg.replace("*const", "")
-    elif arg.startswith("*mut"):
-        starts = "*mut "
-        arg_type = arg.replace("*mut", "")
-    else:
-        arg_type = arg
+    # some callers modify the result, so every call gets its own list
+    return list(analyze_type_cached(arg))
+
+# the same few hundred type strings are analyzed for every field, argument
+# and return type in every generator, so the parsed result is cached
+@lru_cache(maxsize=None)
+def analyze_type_cached(arg):
+    starts = ""
+    arg_type = arg
+    ends = ""
+
+    for (type_prefix, type_starts) in analyze_type_prefixes:
+        if arg.startswith(type_prefix):
+            starts = type_starts
+            # removes every occurrence, so "*const *const u8" => "u8"
+            arg_type = arg.replace(type_prefix, "")
+            break
 
     arg_type = arg_type.strip()
 
     if arg_type.startswith("[") and arg_type.endswith("]"):
-        starts += "["
         arg_type_array = arg_type[1:].split(";")
+        if len(arg_type_array) != 2:
+            raise Exception("analyze_type: expected [type;len] array, got: " + arg)
+        starts += "["
         arg_type = arg_type_array[0]
         ends += ";" + arg_type_array[1]
 
-    return [starts, arg_type, ends]
+    return (starts, arg_type, ends)
 
 def class_is_small_enum(c):
-    return "enum_fields" in c.keys()
+    return "enum_fields" in c
 
 def class_is_small_struct(c):
-    return "struct_fields" in c.keys()
+    return "struct_fields" in c
 
 def class_is_typedef(c):
-    return "callback_typedef" in c.keys()
+    return "callback_typedef" in c
 
 def class_is_stack_allocated(c):
-    class_is_boxed_object = not("external" in c.keys() and ("struct_fields" in c.keys() or "enum_fields" in c.keys() or "callback_typedef" in c.keys() or "const" in c.keys()))
+    class_is_boxed_object = not("external" in c and ("struct_fields" in c or "enum_fields" in c or "callback_typedef" in c or "const" in c))
     return not(class_is_boxed_object)
 
 # Same as calling get_class(search_class_by_name())
 def quick_get_class(api_data, searched_class_name):
-    field_type_class_path = search_for_class_by_class_name(api_data, searched_class_name)
-    if field_type_class_path is None:
-        print("quick_get_class: could not find: " + searched_class_name)
-        raise "quick_get_class: could not find: " + searched_class_name
-    found_c = get_class(api_data, field_type_class_path[0], field_type_class_path[1])
-    if found_c is None:
+    found = resolve_class(api_data, searched_class_name)
+    if found is None:
         print("quick_get_class: could not find: " + searched_class_name)
         raise "quick_get_class: could not find: " + searched_class_name
-    return found_c
+    return found[2]
+
+# The class lookup runs for every argument, field and return type,
+# so each api_data is indexed once as { class_name: (module, classname, class) }
+#
+# api_data is a (unhashable) dict, so the cache is keyed by id() and
+# keeps a reference to the api_data to make sure the id is not reused.
+# The index is not updated when api_data changes, so it only lives for one
+# generate_api() / generate_docs() run, see clear_class_index_cache()
+class_index_cache = {}
+
+def clear_class_index_cache():
+    class_index_cache.clear()
+
+def get_class_index(api_data):
+    cached = class_index_cache.get(id(api_data))
+    if cached is not None and cached[0] is api_data:
+        return cached[1]
+
+    class_index = {}
+    for module_name in api_data:
+        for class_name in api_data[module_name]["classes"]:
+            # first match wins, same as the previous linear search
+            if not(class_name in class_index):
+                class_index[class_name] = (module_name, class_name, api_data[module_name]["classes"][class_name])
+
+    class_index_cache[id(api_data)] = (api_data, class_index)
+    return class_index
 
 # Find the [module, classname] given a class_name, returns None if not found
 # Then you can use get_class() to get the class object
 def search_for_class_by_class_name(api_data, searched_class_name):
-    for module_name in api_data.keys():
-        module = api_data[module_name]
-        for class_name in module["classes"].keys():
-            c = module["classes"][class_name]
-            class_name = class_name
-            if class_name == searched_class_name or class_name == searched_class_name:
-                return [module_name, class_name]
+    found = get_class_index(api_data).get(searched_class_name)
+    if found is None:
+        return None
+    return [found[0], found[1]]
 
-    return None
+# Same as search_for_class_by_class_name(), but also returns the class object,
+# i.e. (module, classname, class) - saves the get_class() call afterwards
+def resolve_class(api_data, searched_class_name):
+    return get_class_index(api_data).get(searched_class_name)
 
 def get_class(api_data, module_name, class_name):
     return api_data[module_name]["classes"][class_name]
 
 # Returns whether a type is external, searches by class_name instead of class_name
 def is_stack_allocated_type(api_data, class_name):
-    search_result = search_for_class_by_class_name(api_data, class_name)
+    search_result = resolve_class(api_data, class_name)
     if search_result is None:
         raise Exception("type not found " + class_name)
-    c = get_class(api_data, search_result[0], search_result[1])
-    return class_is_stack_allocated(c)
+    return class_is_stack_allocated(search_result[2])
 
 # Returns if the class is "pure virtual", i.e. if it is an
 # object consisting of patches instead of being defined in the API
 def class_is_virtual(api_data, className, api):
-    for module_name in api_data.keys():
-        module = api_data[module_name]["classes"]
-        for class_name in module.keys():
-            if class_name != className:
-                continue
-            c = module[class_name]
-            if "use_patches" in c.keys() and api in c["use_patches"]:
-                return True
-
-    return False
+    search_result = resolve_class(api_data, className)
+    if search_result is None:
+        return False
+    c = search_result[2]
+    return "use_patches" in c and api in c["use_patches"]
 
 # Generate the string for TAKING rust-api function arguments
 def rust_bindings_fn_args(f, class_name, class_ptr_name, self_as_first_arg, api_data):
-    fn_args = ""
-    generics = ""
+    fn_args = []
+    generics = []
 
     if self_as_first_arg:
-        self_val = list(f["fn_args"][0].values())[0]
+        self_val = next(iter(f["fn_args"][0].values()))
         if (self_val == "value") or (self_val == "mut value"):
-            fn_args += "self, "
+            fn_args.append("self")
         elif (self_val == "refmut"):
-            fn_args += "&mut self, "
+            fn_args.append("&mut self")
         elif (self_val == "ref"):
-            fn_args += "&self, "
+            fn_args.append("&self")
         else:
             raise Exception("wrong self value " + self_val)
 
     generic_counter = 0
-    if "fn_args" in f.keys():
+    if "fn_args" in f:
         for arg_object in f["fn_args"]:
-            arg_name = list(arg_object.keys())[0]
+            arg_name = next(iter(arg_object))
             if arg_name == "self":
                 continue
             arg_type = arg_object[arg_name]
@@ -389,82 +431,96 @@ def rust_bindings_fn_args(f, class_name, class_ptr_name, self_as_first_arg, api_
             arg_type = type_analyzed[1]
 
             if is_primitive_arg(arg_type):
-                fn_args += arg_name + ": " + start + arg_type + ", " # usize
+                fn_args.append(arg_name + ": " + start + arg_type) # usize
             else:
-                arg_type_class_name = search_for_class_by_class_name(api_data, arg_type)
+                arg_type_class_name = resolve_class(api_data, arg_type)
                 if arg_type_class_name is None:
                     raise Exception("arg type " + arg_type + " not found!")
-                arg_type_class = get_class(api_data, arg_type_class_name[0], arg_type_class_name[1])
+                arg_type_class = arg_type_class_name[2]
                 if class_is_typedef(arg_type_class):
-                    fn_args += arg_name + ": " + start + arg_type_class_name[1] + ", "
-                elif start == "*const " or start == "*mut ":
-                    fn_args += arg_name + ": _" + str(generic_counter) + ", "
-                    generics += "_" + str(generic_counter) + ": Into<" +  start + prefix + arg_type_class_name[1] + ">, "
+                    fn_args.append(arg_name + ": " + start + arg_type_class_name[1])
+                elif start in ("*const ", "*mut "):
+                    fn_args.append(arg_name + ": _" + str(generic_counter))
+                    generics.append("_" + str(generic_counter) + ": Into<" +  start + prefix + arg_type_class_name[1] + ">")
                 else:
-                    fn_args += arg_name + ": _" + str(generic_counter) + ", "
-                    generics += "_" + str(generic_counter) + ": Into<" +  start + arg_type_class_name[1] + ">, "
+                    fn_args.append(arg_name + ": _" + str(generic_counter))
+                    generics.append("_" + str(generic_counter) + ": Into<" +  start + arg_type_class_name[1] + ">")
 
-        fn_args = fn_args[:-2]
-
-    if generics == "":
-        return ["", fn_args]
+    if len(generics) == 0:
+        return ["", ", ".join(fn_args)]
     else:
-        return ["<" + generics[:-2] + ">", fn_args]
+        return ["<" + ", ".join(generics) + ">", ", ".join(fn_args)]
 
 # Generate the string for CALLING rust-api function args
 def rust_bindings_call_fn_args(f, class_name, class_ptr_name, self_as_first_arg, api_data, class_is_boxed_object, self_ext=""):
-    fn_args = ""
-    if self_as_first_arg:
-        self_val = list(f["fn_args"][0].values())[0]
+    fn_args = []
 
-    if "fn_args" in f.keys():
+    if "fn_args" in f:
         for arg_object in f["fn_args"]:
-            arg_name = list(arg_object.keys())[0]
+            arg_name = next(iter(arg_object))
             arg_type = arg_object[arg_name].strip()
 
             if arg_name == "self":
                 if len(self_ext) > 0:
                     if arg_type == "ref":
-                        fn_args += "&self" + self_ext + ", "
+                        fn_args.append("&self" + self_ext)
                     elif arg_type == "refmut":
-                        fn_args += "&mut self" + self_ext + ", "
+                        fn_args.append("&mut self" + self_ext)
                     else:
-                        fn_args += "self" + self_ext + ", "
+                        fn_args.append("self" + self_ext)
                 else:
-                    fn_args += "self" + self_ext + ", "
+                    fn_args.append("self" + self_ext)
                 continue
 
-            starts = ""
             type_analyzed = analyze_type(arg_type)
             start = type_analyzed[0]
             arg_type = type_analyzed[1]
 
             if is_primitive_arg(arg_type):
-                fn_args += arg_name + ", "
+                fn_args.append(arg_name)
             else:
                 arg_type = arg_type.strip()
-                arg_type_class = search_for_class_by_class_name(api_data, arg_type)
+                arg_type_class = resolve_class(api_data, arg_type)
                 if arg_type_class is None:
                     raise Exception("arg type " + arg_type + " not found!")
-                arg_type_class = get_class(api_data, arg_type_class[0], arg_type_class[1])
+                arg_type_class = arg_type_class[2]
 
-                if start == "*const " or start == "*mut ":
+                if start in ("*const ", "*mut "):
                     if len(self_ext) > 0:
-                        fn_args += "unsafe { core::mem::transmute(" + arg_name + ".into()) }, "
+                        fn_args.append("unsafe { core::mem::transmute(" + arg_name + ".into()) }")
                     else:
-                        fn_args += arg_name + self_ext + ".into(), "
+                        fn_args.append(arg_name + self_ext + ".into()")
                 else:
                     if class_is_typedef(arg_type_class):
-                        fn_args += start + arg_name + self_ext + ", "
+                        fn_args.append(start + arg_name + self_ext)
                     elif class_is_stack_allocated(arg_type_class):
-                        fn_args += start + arg_name + self_ext + ".into(), " # .object
+                        fn_args.append(start + arg_name + self_ext + ".into()") # .object
                     else:
-                        fn_args += start + arg_name + self_ext + ".into(), "
+                        fn_args.append(start + arg_name + self_ext + ".into()")
 
-        fn_args = fn_args[:-2]
+    return ", ".join(fn_args)
 
-    return fn_args
 
+# Returns the C-API return type of a constructor / function, i.e. "*const AzFoo"
+# for "*const Foo" - primitive types are returned as-is without a class lookup
+def rust_dll_return_type(api_data, return_type):
+    analyzed_return_type = analyze_type(return_type)
+    if is_primitive_arg(analyzed_return_type[1]):
+        return return_type
+
+    return_type_class = search_for_class_by_class_name(api_data, analyzed_return_type[1])
+    if return_type_class is None:
+        print("rust-dll: no return_type_class found for " + return_type)
+
+    return f"{analyzed_return_type[0]}{prefix}{return_type_class[1]}{analyzed_return_type[2]}" # no postfix
+
+# Appends a "/// " doc comment to the generated code, one comment line per line of text
+def emit_doc(code, text):
+    if "\n" in text:
+        for line in text.splitlines():
+            code.append(f"/// {line}\r\n")
+    else:
+        code.append(f"/// {text}\r\n")
 
 # ---------------------------------------------------------------------------------------------
 
@@ -476,62 +532,48 @@ def rust_bindings_call_fn_args(f, class_name, class_ptr_name, self_as_first_arg,
 #   [
 #      dll.rs code,
 #      all structs (in order of dependency),
-#      all functions (in order of appearance),
+#      all functions as (fn_name, fn_args, return_type) tuples (in order of appearance),
 #      C forward_declarations,
 #   ]
 #
-def generate_rust_dll(api_data):
+def generate_rust_dll(api_data, version):
 
-    version = list(api_data.keys())[-1]
-    code = ""
-    code += "//! WARNING: autogenerated code for azul api version " + str(version) + "\r\n"
-    code += "\r\n"
-    code += "#![deny(improper_ctypes_definitions)]\r\n"
-    code += "\r\n"
+    code = []
+    code.append(f"//! WARNING: autogenerated code for azul api version {version}\r\n")
+    code.append("\r\n#![deny(improper_ctypes_definitions)]\r\n\r\n")
 
-    code += read_file(root_folder + "/api/_patches/azul-dll/header.rs")
+    code.append(read_file(root_folder + "/api/_patches/azul-dll/header.rs"))
 
-    code += "\r\n"
-    code += "pub mod widgets;\r\n"
-    code += "#[cfg(all(feature = \"python-extension\", feature = \"link_dynamic\", not(feature = \"link-static\")))]\r\n"
-    code += "pub mod python;\r\n"
-    code += "\r\n"
+    code.append("\r\npub mod widgets;\r\n")
+    code.append("#[cfg(all(feature = \"python-extension\", feature = \"link_dynamic\", not(feature = \"link-static\")))]\r\n")
+    code.append("pub mod python;\r\n\r\n")
 
     myapi_data = api_data[version]
 
     structs_map = OrderedDict({})
-    rust_functions_map = OrderedDict({})
+    rust_functions_map = [] # (fn_name, fn_args, return_type), in order of appearance
 
-    for module_name in myapi_data.keys():
+    for module_name in myapi_data:
         module = myapi_data[module_name]["classes"]
 
-        for class_name in module.keys():
+        for class_name in module:
             c = module[class_name]
 
-            code += "\r\n"
+            code.append("\r\n")
 
             class_is_boxed_object = not(class_is_stack_allocated(c))
-            class_is_const = "const" in c.keys()
+            class_is_const = "const" in c
             class_can_be_cloned = True
-            if "clone" in c.keys():
+            if "clone" in c:
                 class_can_be_cloned = c["clone"]
 
-            struct_derive = []
-            if "derive" in c.keys():
-                struct_derive = c["derive"]
+            struct_derive = c.get("derive", [])
+            class_can_be_copied = "Copy" in struct_derive
 
-            class_can_derive_debug = "derive" in c.keys() and "Debug" in c["derive"]
-            class_can_be_copied = "derive" in c.keys() and "Copy" in c["derive"]
-            class_has_partialeq = "derive" in c.keys() and "PartialEq" in c["derive"]
-            class_has_eq = "derive" in c.keys()and "Eq" in c["derive"]
-            class_has_partialord = "derive" in c.keys()and "PartialOrd" in c["derive"]
-            class_has_ord = "derive" in c.keys() and "Ord" in c["derive"]
-            class_can_be_hashed = "derive" in c.keys() and "Hash" in c["derive"]
-
-            class_has_custom_destructor = ("custom_destructor" in c.keys() and c["custom_destructor"])
-            class_is_callback_typedef = "callback_typedef" in c.keys() and (len(c["callback_typedef"].keys()) > 0)
-            is_boxed_object = "is_boxed_object" in c.keys() and c["is_boxed_object"]
-            treat_external_as_ptr = "external" in c.keys() and is_boxed_object
+            class_has_custom_destructor = ("custom_destructor" in c and c["custom_destructor"])
+            class_is_callback_typedef = "callback_typedef" in c and (len(c["callback_typedef"]) > 0)
+            is_boxed_object = "is_boxed_object" in c and c["is_boxed_object"]
+            treat_external_as_ptr = "external" in c and is_boxed_object
 
             # Small structs and enums are stack-allocated in order to save on indirection
             # They don't have destructors, since they
@@ -540,31 +582,31 @@ def generate_rust_dll(api_data):
             class_ptr_name = prefix + class_name
 
             if class_is_callback_typedef:
-                code += "pub type " + class_ptr_name + " = " + generate_rust_callback_fn_type(myapi_data, c["callback_typedef"]) + ";"
+                code.append(f"pub type {class_ptr_name} = {generate_rust_callback_fn_type(myapi_data, c['callback_typedef'])};")
                 structs_map[class_ptr_name] = { "callback_typedef": c["callback_typedef"] }
                 continue
 
             class_has_recursive_destructor = has_recursive_destructor(myapi_data, c)
 
             struct_doc = ""
-            if "doc" in c.keys():
+            if "doc" in c:
                 struct_doc = c["doc"]
             else:
                 if c_is_stack_allocated:
-                    struct_doc = "Re-export of rust-allocated (stack based) `" + class_name + "` struct"
+                    struct_doc = f"Re-export of rust-allocated (stack based) `{class_name}` struct"
                 else:
-                    struct_doc = "Pointer to rust-allocated `Box<" + class_name + ">` struct"
+                    struct_doc = f"Pointer to rust-allocated `Box<{class_name}>` struct"
 
-            code += "/// " + struct_doc  + "\r\n"
+            emit_doc(code, struct_doc)
 
             struct_serde = ""
-            if "serde" in c.keys():
+            if "serde" in c:
                 struct_serde = c["serde"]
 
-            if "external" in c.keys():
+            if "external" in c:
                 external_path = c["external"]
                 if class_is_const:
-                    code += "pub static " + class_ptr_name + ": " + prefix + c["const"] + " = " + external_path + ";\r\n"
+                    code.append(f"pub static {class_ptr_name}: {prefix}{c['const']} = {external_path};\r\n")
                 elif class_is_boxed_object:
                     structs_map[class_ptr_name] = {
                         "external": external_path,
@@ -580,12 +622,12 @@ def generate_rust_dll(api_data):
                         structs_map[class_ptr_name]["serde"] = struct_serde
 
                     if treat_external_as_ptr:
-                        code += "pub use " + external_path + " as " + class_ptr_name + "TT;\r\n"
-                        code += "pub use " + class_ptr_name + "TT as " + class_ptr_name + ";\r\n"
+                        code.append(f"pub use {external_path} as {class_ptr_name}TT;\r\n")
+                        code.append(f"pub use {class_ptr_name}TT as {class_ptr_name};\r\n")
                     else:
-                        code += "#[repr(C)] pub struct " + class_ptr_name + " { pub ptr: *mut c_void }\r\n"
+                        code.append(f"#[repr(C)] pub struct {class_ptr_name} {{ pub ptr: *mut c_void }}\r\n")
                 else:
-                    if "struct_fields" in c.keys():
+                    if "struct_fields" in c:
                         structs_map[class_ptr_name] = {
                             "external": external_path,
                             "clone": class_can_be_cloned,
@@ -598,7 +640,7 @@ def generate_rust_dll(api_data):
                         }
                         if len(struct_serde) > 0:
                             structs_map[class_ptr_name]["serde"] = struct_serde
-                    elif "enum_fields" in c.keys():
+                    elif "enum_fields" in c:
                         structs_map[class_ptr_name] = {
                             "external": external_path,
                             "clone": class_can_be_cloned,
@@ -612,11 +654,11 @@ def generate_rust_dll(api_data):
                         if len(struct_serde) > 0:
                             structs_map[class_ptr_name]["serde"] = struct_serde
 
-                    code += "pub use " + external_path + " as " + class_ptr_name + "TT;\r\n"
-                    code += "pub use " + class_ptr_name + "TT as " + class_ptr_name + ";\r\n"
+                    code.append(f"pub use {external_path} as {class_ptr_name}TT;\r\n")
+                    code.append(f"pub use {class_ptr_name}TT as {class_ptr_name};\r\n")
             else:
                 raise Exception("structs without 'external' key are not allowed! " + class_name)
-            if "constructors" in c.keys():
+            if "constructors" in c:
                 for fn_name in c["constructors"]:
 
                     const = c["constructors"][fn_name]
@@ -626,69 +668,52 @@ def generate_rust_dll(api_data):
                     if c_is_stack_allocated:
                         fn_body += const["fn_body"]
                     else:
-                        fn_body += "let object: " + class_name + " = " + const["fn_body"] + "; " # note: security check, that the returned object is of the correct type
+                        fn_body += f"let object: {class_name} = {const['fn_body']}; " # note: security check, that the returned object is of the correct type
                         fn_body += "let ptr = Box::into_raw(Box::new(object)) as *mut c_void; "
-                        fn_body += class_ptr_name + " { ptr }"
+                        fn_body += f"{class_ptr_name} {{ ptr }}"
 
-                    if "doc" in const.keys():
-                        code += "/// " + const["doc"] + "\r\n"
+                    if "doc" in const:
+                        emit_doc(code, const["doc"])
                     else:
-                        code += "/// Creates a new `" + class_name + "` instance whose memory is owned by the rust allocator\r\n"
-                        code += "/// Equivalent to the Rust `" + class_name  + "::" + fn_name + "()` constructor.\r\n"
+                        emit_doc(code, f"Creates a new `{class_name}` instance whose memory is owned by the rust allocator")
+                        emit_doc(code, f"Equivalent to the Rust `{class_name}::{fn_name}()` constructor.")
 
                     returns = class_ptr_name
-                    if "returns" in const.keys():
-                        return_type = const["returns"]["type"]
-                        analyzed_return_type = analyze_type(return_type)
-                        if is_primitive_arg(analyzed_return_type[1]):
-                            returns = return_type
-                        else:
-                            return_type_class = search_for_class_by_class_name(myapi_data, analyzed_return_type[1])
-                            if return_type_class is None:
-                                print("rust-dll: (line 549): no return_type_class found for " + return_type)
-
-                            returns = analyzed_return_type[0] + prefix + return_type_class[1] + analyzed_return_type[2] # no postfix
-
+                    if "returns" in const:
+                        returns = rust_dll_return_type(myapi_data, const["returns"]["type"])
 
                     fn_args = fn_args_c_api(const, class_name, class_ptr_name, False, myapi_data)
+                    c_fn_name = class_ptr_name + "_" + snake_case_to_lower_camel(fn_name)
 
-                    rust_functions_map[str(class_ptr_name + "_" + snake_case_to_lower_camel(fn_name))] = [fn_args, returns];
-                    code += "#[no_mangle] pub extern \"C\" fn " + class_ptr_name + "_" + snake_case_to_lower_camel(fn_name) + "(" + fn_args + ") -> " + returns + " { "
-                    code += fn_body
-                    code += " }\r\n"
+                    rust_functions_map.append((c_fn_name, fn_args, returns))
+                    code.append(f"#[no_mangle] pub extern \"C\" fn {c_fn_name}({fn_args}) -> {returns} {{ ")
+                    code.append(fn_body)
+                    code.append(" }\r\n")
 
-            if "functions" in c.keys():
+            if "functions" in c:
                 for fn_name in c["functions"]:
 
                     f = c["functions"][fn_name]
 
                     fn_body = f["fn_body"]
 
-                    if "doc" in f.keys():
-                        code += "/// " + f["doc"] + "\r\n"
+                    if "doc" in f:
+                        emit_doc(code, f["doc"])
                     else:
-                        code += "/// Equivalent to the Rust `" + class_name  + "::" + fn_name + "()` function.\r\n"
+                        emit_doc(code, f"Equivalent to the Rust `{class_name}::{fn_name}()` function.")
 
                     fn_args = fn_args_c_api(f, class_name, class_ptr_name, True, myapi_data)
 
                     returns = ""
-                    if "returns" in f.keys():
-                        return_type = f["returns"]["type"]
-                        analyzed_return_type = analyze_type(return_type)
-                        if is_primitive_arg(analyzed_return_type[1]):
-                            returns = return_type
-                        else:
-                            return_type_class = search_for_class_by_class_name(myapi_data, analyzed_return_type[1])
-                            if return_type_class is None:
-                                print("rust-dll: (line 549): no return_type_class found for " + return_type)
-
-                            returns = analyzed_return_type[0] + prefix + return_type_class[1] + analyzed_return_type[2] # no postfix
+                    if "returns" in f:
+                        returns = rust_dll_return_type(myapi_data, f["returns"]["type"])
 
-                    rust_functions_map[str(class_ptr_name + "_" + snake_case_to_lower_camel(fn_name))] = [fn_args, returns];
+                    c_fn_name = class_ptr_name + "_" + snake_case_to_lower_camel(fn_name)
+                    rust_functions_map.append((c_fn_name, fn_args, returns))
                     return_arrow = "" if returns == "" else " -> "
-                    code += "#[no_mangle] pub extern \"C\" fn " + class_ptr_name + "_" + snake_case_to_lower_camel(fn_name) + "(" + fn_args + ")" + return_arrow + returns + " { "
-                    code += fn_body
-                    code += " }\r\n"
+                    code.append(f"#[no_mangle] pub extern \"C\" fn {c_fn_name}({fn_args}){return_arrow}{returns} {{ ")
+                    code.append(fn_body)
+                    code.append(" }\r\n")
 
             if c_is_stack_allocated:
                 if class_can_be_copied:
@@ -696,34 +721,34 @@ def generate_rust_dll(api_data):
                     pass
                 elif class_has_custom_destructor or treat_external_as_ptr or class_has_recursive_destructor:
                     # az_item_delete()
-                    code += "/// Destructor: Takes ownership of the `" + class_name + "` pointer and deletes it.\r\n"
+                    emit_doc(code, f"Destructor: Takes ownership of the `{class_name}` pointer and deletes it.")
                     if class_has_custom_destructor or treat_external_as_ptr:
-                        rust_functions_map[str(class_ptr_name + "_delete")] = ["object: &mut " + class_ptr_name, ""];
-                    code += "#[no_mangle] pub extern \"C\" fn " + class_ptr_name + "_delete(object: &mut " + class_ptr_name + ") { "
+                        rust_functions_map.append((f"{class_ptr_name}_delete", f"object: &mut {class_ptr_name}", ""))
+                    code.append(f"#[no_mangle] pub extern \"C\" fn {class_ptr_name}_delete(object: &mut {class_ptr_name}) {{ ")
                     if is_boxed_object:
-                        code += " if object.run_destructor { unsafe { core::ptr::drop_in_place(object); } }"
+                        code.append(" if object.run_destructor { unsafe { core::ptr::drop_in_place(object); } }")
                     else:
-                        code += " unsafe { core::ptr::drop_in_place(object); } "
-                    code += "}\r\n"
+                        code.append(" unsafe { core::ptr::drop_in_place(object); } ")
+                    code.append("}\r\n")
 
                 if treat_external_as_ptr and class_can_be_cloned:
                     # az_item_deepCopy()
-                    code += "/// Clones the object\r\n"
-                    rust_functions_map[str(class_ptr_name + "_deepCopy")] = ["object: &" + class_ptr_name, class_ptr_name];
-                    code += "#[no_mangle] pub extern \"C\" fn " + class_ptr_name + "_deepCopy(object: &" + class_ptr_name + ") -> " + class_ptr_name + " { "
-                    code += "object.clone()"
-                    code += " }\r\n"
+                    emit_doc(code, "Clones the object")
+                    rust_functions_map.append((f"{class_ptr_name}_deepCopy", f"object: &{class_ptr_name}", class_ptr_name))
+                    code.append(f"#[no_mangle] pub extern \"C\" fn {class_ptr_name}_deepCopy(object: &{class_ptr_name}) -> {class_ptr_name} {{ ")
+                    code.append("object.clone()")
+                    code.append(" }\r\n")
             else:
-                raise Exception("type " + class_name + "is not stack allocated!")
+                raise Exception(f"type {class_name}is not stack allocated!")
 
     sort_structs_result = sort_structs_map(myapi_data, structs_map)
     structs_map = sort_structs_result[0]
     forward_delcarations = sort_structs_result[1]
 
-    code += "\r\n\r\n"
-    code += generate_size_test(myapi_data, structs_map)
+    code.append("\r\n\r\n")
+    code.append(generate_size_test(myapi_data, structs_map))
 
-    return [code, structs_map, rust_functions_map, forward_delcarations]
+    return ["".join(code), structs_map, rust_functions_map, forward_delcarations]
 
 # Searches recursively for all fields on a class whether
 # any of the fields have a destructor
@@ -733,35 +758,34 @@ def generate_rust_dll(api_data):
 # @returns bool
 def has_recursive_destructor(myapi_data, c):
 
-    class_is_callback_typedef = "callback_typedef" in c.keys() and (len(c["callback_typedef"].keys()) > 0)
+    class_is_callback_typedef = "callback_typedef" in c and (len(c["callback_typedef"]) > 0)
 
     if class_is_callback_typedef:
         return False
 
-    class_has_custom_destructor = ("custom_destructor" in c.keys() and c["custom_destructor"])
-    is_boxed_object = "is_boxed_object" in c.keys() and c["is_boxed_object"]
-    treat_external_as_ptr = "external" in c.keys() and is_boxed_object
+    class_has_custom_destructor = ("custom_destructor" in c and c["custom_destructor"])
+    is_boxed_object = "is_boxed_object" in c and c["is_boxed_object"]
+    treat_external_as_ptr = "external" in c and is_boxed_object
 
     if class_has_custom_destructor or treat_external_as_ptr:
         return True
 
     # loop through fields and recurse
-    if "struct_fields" in c.keys():
+    if "struct_fields" in c:
         for field in c["struct_fields"]:
-            field_name = list(field.keys())[0]
-            if not "type" in field[field_name]:
+            field_name, field_value = next(iter(field.items()))
+            if not "type" in field_value:
                 print("error: struct " + str(c) + " field " + field_name + " has no \"type\"!")
-            field_type = field[field_name]["type"]
+            field_type = field_value["type"]
             field_type_analyzed = analyze_type(field_type)
             if is_primitive_arg(field_type_analyzed[1]):
                 continue
             if has_recursive_destructor(myapi_data, quick_get_class(myapi_data, field_type_analyzed[1])):
                 return True
-    elif "enum_fields" in c.keys():
+    elif "enum_fields" in c:
         for enum_name in c["enum_fields"]:
-            variant_name = list(enum_name.keys())[0]
-            variant = enum_name[variant_name]
-            if "type" in variant.keys():
+            variant_name, variant = next(iter(enum_name.items()))
+            if "type" in variant:
                 field_type_analyzed = analyze_type(variant["type"])
                 if is_primitive_arg(field_type_analyzed[1]):
                     continue
@@ -779,13 +803,41 @@ def has_recursive_destructor(myapi_data, c):
 # This function generates a list of all these imports
 def generate_list_of_struct_imports(structs_map):
     import_str = ""
-    for struct_name in structs_map.keys():
+    for struct_name in structs_map:
         struct = structs_map[struct_name]
-        if "external" in struct.keys():
+        if "external" in struct:
             external_ref = struct["external"]
             import_str += "use " + external_ref + " as " + struct_name + ";\r\n"
     return import_str
 
+# Yields (field_name, field) for all struct fields / enum variants of a class
+# in the structs_map, i.e. ("ptr", {"type": "*mut c_void"}) - enum variants
+# without a type are skipped unless include_untyped is set
+def iter_fields(class_name, clazz, include_untyped=False):
+    if "struct" in clazz:
+        for field in clazz["struct"]:
+            field_name, field = next(iter(field.items()))
+            if not "type" in field:
+                raise Exception("missing type field in " + class_name + " " + field_name)
+            yield (field_name, field)
+    elif "enum" in clazz:
+        for variant in clazz["enum"]:
+            variant_name, variant = next(iter(variant.items()))
+            if include_untyped or "type" in variant:
+                yield (variant_name, variant)
+    else:
+        raise Exception("sort_structs_map: not enum nor struct nor typedef" + class_name + "")
+
+# Same as iter_fields(), but yields (field_name, field_type), i.e. ("ptr", "*mut c_void")
+def iter_field_types(class_name, clazz):
+    for (field_name, field) in iter_fields(class_name, clazz):
+        yield (field_name, field["type"])
+
+# A struct field / enum variant as analyzed by generate_structs():
+# type is None for enum variants without a type, class_path is the
+# resolve_class() result (None for primitive types)
+FieldInfo = namedtuple("FieldInfo", ["name", "type", "extra_derive", "analyzed", "class_path"])
+
 # Returns a sorted structs map where the structs are sorted
 # so that all structs that a class depends on as fields appear
 # before the class itself
@@ -811,113 +863,86 @@ def sort_structs_map(api_data, structs_map):
         ("AzMenuItemVec", "MenuItem")
     ])
 
-    classes_not_found = OrderedDict([])
-
-    # first, insert all types that only have primitive types as fields
-    for class_name in structs_map.keys():
+    # first, collect the dependencies of every class once: all field / variant types
+    # that are not primitive, not function pointers and not forward-declared
+    class_deps = OrderedDict([])
+    # field type -> whether it is a dependency at all (not primitive, not a
+    # function pointer), most types are used as fields by many classes
+    type_is_dependency = {}
+    for class_name in structs_map:
         clazz = structs_map[class_name]
-        should_insert_struct = True
-
-        found_c_is_callback_typedef = "callback_typedef" in clazz.keys() and (len(clazz["callback_typedef"].keys()) > 0)
-        found_c_is_boxed_object = "is_boxed_object" in clazz.keys() and clazz["is_boxed_object"]
-        class_in_forward_decl = class_name in forward_delcarations.keys()
+        deps = set()
 
+        # function pointers have no fields, so they don't depend on anything
+        found_c_is_callback_typedef = "callback_typedef" in clazz and (len(clazz["callback_typedef"]) > 0)
         if found_c_is_callback_typedef:
-            pass
-        elif "struct" in clazz.keys():
-            struct = clazz["struct"]
-            for field in struct:
-                field_name = list(field.keys())[0]
-                field_type = list(field.values())[0]
-                if not "type" in field_type:
-                    raise Exception("missing type field in " + class_name + " " + field_name)
-                field_type = analyze_type(field_type["type"])[1]
-                if not(is_primitive_arg(field_type)):
-                    found_c = search_for_class_by_class_name(api_data, field_type)
-                    if found_c is None:
-                        print("struct " + field_type + " not found")
-                    field_is_fn_ptr = class_is_typedef(get_class(api_data, found_c[0], found_c[1]))
-                    if not(class_in_forward_decl and field_type == forward_delcarations[class_name]) and not(field_is_fn_ptr):
-                        should_insert_struct = False
-        elif "enum" in clazz.keys():
-            enum = clazz["enum"]
-            for variant in enum:
-                variant_name = list(variant.keys())[0]
-                variant_type = list(variant.values())[0]
-                if "type" in variant_type.keys():
-                    variant_type = analyze_type(variant_type["type"])[1]
-                    if not(is_primitive_arg(variant_type)):
-                        found_c = search_for_class_by_class_name(api_data, variant_type)
-                        if found_c is None:
-                            print("sort structs map: " + class_name + " variant " + variant_type + " not found")
-                        field_is_fn_ptr = class_is_typedef(get_class(api_data, found_c[0], found_c[1]))
-                        if not(class_in_forward_decl and variant_type == forward_delcarations[class_name]) and not(field_is_fn_ptr):
-                            should_insert_struct = False
-        else:
-            raise Exception("sort_structs_map: not enum nor struct nor typedef" + class_name + "")
+            class_deps[class_name] = deps
+            continue
 
-        if should_insert_struct:
-            sorted_class_map[class_name] = clazz
-        else:
-            classes_not_found[class_name] = clazz
-
-    # Now loop through every class that was not a primitive type
-    # usually this should resolve in 9 - 10 iterations
-    iteration_count = 0;
-    while not(len(classes_not_found.keys()) == 0):
-        # classes not found in this iteration
-        current_classes_not_found = OrderedDict([])
-
-        for class_name in classes_not_found.keys():
-            clazz = classes_not_found[class_name]
-            should_insert_struct = True
-            found_c_is_callback_typedef = "callback_typedef" in clazz.keys() and (len(clazz["callback_typedef"].keys()) > 0)
-            class_in_forward_decl = class_name in forward_delcarations.keys()
-            if found_c_is_callback_typedef:
-                pass
-            elif "struct" in clazz.keys():
-                struct = clazz["struct"]
-                for field in struct:
-                    field_name = list(field.keys())[0]
-                    field_type = list(field.values())[0]
-                    field_type = analyze_type(field_type["type"])[1]
-                    if not(is_primitive_arg(field_type)):
-                        found_c = search_for_class_by_class_name(api_data, field_type)
-                        field_is_fn_ptr = class_is_typedef(get_class(api_data, found_c[0], found_c[1]))
-                        if not(class_in_forward_decl and field_type == forward_delcarations[class_name]) and not(field_is_fn_ptr):
-                            field_type = prefix + field_type
-                            if not(field_type in sorted_class_map.keys()):
-                                should_insert_struct = False
-            elif "enum" in clazz.keys():
-                enum = clazz["enum"]
-                for variant in enum:
-                    variant_name = list(variant.keys())[0]
-                    variant_type = list(variant.values())[0]
-                    if "type" in variant_type.keys():
-                        variant_type = analyze_type(variant_type["type"])[1]
-                        if not(is_primitive_arg(variant_type)):
-                            found_c = search_for_class_by_class_name(api_data, variant_type)
-                            field_is_fn_ptr = class_is_typedef(get_class(api_data, found_c[0], found_c[1]))
-                            if not(class_in_forward_decl and variant_type == forward_delcarations[class_name]) and not(field_is_fn_ptr):
-                                variant_type = prefix + variant_type
-                                if not(variant_type in sorted_class_map.keys()):
-                                    should_insert_struct = False
-            else:
-                raise Exception("sort_structs_map: not enum nor struct " + class_name + "")
+        forward_decl = forward_delcarations.get(class_name)
 
-            if should_insert_struct:
-                sorted_class_map[class_name] = clazz
+        for (field_name, field_type) in iter_field_types(class_name, clazz):
+            field_type = analyze_type(field_type)[1]
+            if not(field_type in type_is_dependency):
+                is_dependency = False
+                if not(is_primitive_arg(field_type)):
+                    found_c = resolve_class(api_data, field_type)
+                    if found_c is None:
+                        print("sort structs map: " + class_name + " field " + field_type + " not found")
+                    is_dependency = not(class_is_typedef(found_c[2]))
+                type_is_dependency[field_type] = is_dependency
+            if type_is_dependency[field_type] and field_type != forward_decl:
+                deps.add(prefix + field_type)
+
+        class_deps[class_name] = deps
+
+    # Kahn's algorithm: start with the classes without dependencies, every time a
+    # class is resolved, decrement the missing dependency count of its dependents
+    class_index = {}
+    dependents = defaultdict(list)
+    missing_deps = {}
+    resolve_queue = deque()
+    for class_name in class_deps:
+        class_index[class_name] = len(class_index)
+        missing_deps[class_name] = len(class_deps[class_name])
+        for dep in class_deps[class_name]:
+            dependents[dep].append(class_name)
+        if missing_deps[class_name] == 0:
+            resolve_queue.append(class_name)
+
+    # The output order is "rounds" of the declaration order: round 0 are the classes
+    # without dependencies, then every round inserts all classes whose dependencies were
+    # inserted in an earlier round (or earlier in the same round), so a class can share
+    # the round of a dependency that was declared before it, otherwise it comes one later
+    class_round = {}
+    while len(resolve_queue) > 0:
+        class_name = resolve_queue.popleft()
+        current_round = 0
+        for dep in class_deps[class_name]:
+            if class_round[dep] == 0:
+                dep_round = 1
+            elif class_index[dep] < class_index[class_name]:
+                dep_round = class_round[dep]
             else:
-                current_classes_not_found[class_name] = clazz
-
-
-        classes_not_found = current_classes_not_found
-        iteration_count += 1
-
-        # NOTE: if the iteration count is extremely high,
-        # something is wrong with the script
-        if iteration_count > 500:
-            raise Exception("infinite recursion detected in sort_structs_map: " + str(len(current_classes_not_found.keys())) + " unresolved structs = " + str(current_classes_not_found.keys()) + "\r\n")
+                dep_round = class_round[dep] + 1
+            current_round = max(current_round, dep_round)
+        class_round[class_name] = current_round
+
+        for dependent in dependents[class_name]:
+            missing_deps[dependent] -= 1
+            if missing_deps[dependent] == 0:
+                resolve_queue.append(dependent)
+
+    # classes left over depend on themselves or on a class that isn't in the structs_map
+    if len(class_round) != len(class_deps):
+        classes_not_found = OrderedDict([])
+        for class_name in class_deps:
+            if not(class_name in class_round):
+                classes_not_found[class_name] = structs_map[class_name]
+        raise Exception("infinite recursion detected in sort_structs_map: " + str(len(classes_not_found)) + " unresolved structs = " + str(classes_not_found.keys()) + "\r\n")
+
+    for class_name in sorted(class_round, key=lambda c: (class_round[c], class_index[c])):
+        sorted_class_map[class_name] = structs_map[class_name]
 
     return [sorted_class_map, forward_delcarations, extra_forward_delcarations]
 
@@ -928,31 +953,32 @@ def generate_structs(api_data, structs_map, autoderive, indent = 4, private_poin
 
     indent_str = " " * indent
 
-    code = ""
+    code = []
 
-    for struct_name in structs_map.keys():
+    for struct_name in structs_map:
         struct = structs_map[struct_name]
 
-        if "doc" in struct.keys():
-            code += indent_str + "/// " + struct["doc"] + "\r\n"
+        if "doc" in struct:
+            code.append(f"{indent_str}/// {struct['doc']}\r\n")
         else:
-            code += indent_str + "/// `" + struct_name + "` struct\r\n"
-
-        class_is_callback_typedef = "callback_typedef" in struct.keys() and (len(struct["callback_typedef"].keys()) > 0)
-        class_can_be_copied = "derive" in struct.keys() and "Copy" in struct["derive"]
-        class_can_be_serde_serialized = "derive" in struct.keys() and "Serialize" in struct["derive"]
-        class_can_be_serde_deserialized = "derive" in struct.keys() and "Deserialize" in struct["derive"]
-        class_implements_default = "derive" in struct.keys() and "Default" in struct["derive"]
-        class_implements_eq = "derive" in struct.keys() and "Eq" in struct["derive"]
-        class_implements_ord = "derive" in struct.keys() and "Ord" in struct["derive"]
-        class_implements_hash = "derive" in struct.keys() and "Hash" in struct["derive"]
-        class_has_custom_destructor = "custom_destructor" in struct.keys() and struct["custom_destructor"]
+            code.append(f"{indent_str}/// `{struct_name}` struct\r\n")
+
+        class_is_callback_typedef = "callback_typedef" in struct and (len(struct["callback_typedef"]) > 0)
+        struct_derives = set(struct.get("derive", ()))
+        class_can_be_copied = "Copy" in struct_derives
+        class_can_be_serde_serialized = "Serialize" in struct_derives
+        class_can_be_serde_deserialized = "Deserialize" in struct_derives
+        class_implements_default = "Default" in struct_derives
+        class_implements_eq = "Eq" in struct_derives
+        class_implements_ord = "Ord" in struct_derives
+        class_implements_hash = "Hash" in struct_derives
+        class_has_custom_destructor = "custom_destructor" in struct and struct["custom_destructor"]
         class_can_be_cloned = True
-        if "clone" in struct.keys():
+        if "clone" in struct:
             class_can_be_cloned = struct["clone"]
 
-        is_boxed_object = "is_boxed_object" in struct.keys() and struct["is_boxed_object"]
-        treat_external_as_ptr = "external" in struct.keys() and is_boxed_object
+        is_boxed_object = "is_boxed_object" in struct and struct["is_boxed_object"]
+        treat_external_as_ptr = "external" in struct and is_boxed_object
 
 
         opt_derive_default = ""
@@ -961,8 +987,8 @@ def generate_structs(api_data, structs_map, autoderive, indent = 4, private_poin
 
         opt_derive_serde_extra_options = ""
         if class_can_be_serde_serialized or class_can_be_serde_deserialized:
-            if "serde" in struct.keys():
-                opt_derive_serde_extra_options = indent_str + "#[cfg_attr(feature = \"serde-support\", serde(" + struct["serde"] + "))]\r\n"
+            if "serde" in struct:
+                opt_derive_serde_extra_options = f"{indent_str}#[cfg_attr(feature = \"serde-support\", serde({struct['serde']}))]\r\n"
 
         opt_derive_serde = ""
         if class_can_be_serde_serialized and class_can_be_serde_deserialized:
@@ -979,9 +1005,8 @@ def generate_structs(api_data, structs_map, autoderive, indent = 4, private_poin
 
         if class_is_callback_typedef:
             fn_ptr = generate_rust_callback_fn_type(api_data, struct["callback_typedef"])
-            code += indent_str + "pub type " + struct_name + " = " + fn_ptr + ";\r\n\r\n"
-        elif "struct" in struct.keys():
-            struct = struct["struct"]
+            code.append(f"{indent_str}pub type {struct_name} = {fn_ptr};\r\n\r\n")
+        elif "struct" in struct:
 
             # for LayoutCallback and RefAny, etc. the #[derive(Debug)] has to be implemented manually
 
@@ -1022,83 +1047,84 @@ def generate_structs(api_data, structs_map, autoderive, indent = 4, private_poin
                 if class_implements_hash:
                     opt_derive_hash = indent_str + "#[derive(Hash)]\r\n"
 
-            for field in struct:
-                if "type" in list(field.values())[0]:
-                    analyzed_arg_type = analyze_type(list(field.values())[0]["type"])
-                    if not(is_primitive_arg(analyzed_arg_type[1])):
-                        field_type_class_path = search_for_class_by_class_name(api_data, analyzed_arg_type[1])
-                        if field_type_class_path is None:
-                            print("no field_type_class_path found for " + str(analyzed_arg_type))
-                        found_c = get_class(api_data, field_type_class_path[0], field_type_class_path[1])
-                        found_c_is_callback_typedef = "callback_typedef" in found_c.keys() and found_c["callback_typedef"]
-                        if found_c_is_callback_typedef:
-                            opt_derive_debug = ""
-                            opt_derive_other = ""
+            # analyze the fields once: function pointer fields prevent deriving Debug / PartialEq,
+            # the analyzed fields are then used to emit the struct body below
+            analyzed_fields = []
+            for (field_name, field_type) in iter_fields(struct_name, structs_map[struct_name]):
+                field_extra_derive = ""
+                if "derive" in field_type:
+                    field_extra_derive = field_type["derive"] + "\r\n"
+                field_type = field_type["type"]
+                analyzed_arg_type = analyze_type(field_type)
+                field_type_class_path = None
+                if not(is_primitive_arg(analyzed_arg_type[1])):
+                    field_type_class_path = resolve_class(api_data, analyzed_arg_type[1])
+                    if field_type_class_path is None:
+                        print("no field_type_class_path found for " + str(analyzed_arg_type))
+                    found_c = field_type_class_path[2]
+                    found_c_is_callback_typedef = "callback_typedef" in found_c and found_c["callback_typedef"]
+                    if found_c_is_callback_typedef:
+                        opt_derive_debug = ""
+                        opt_derive_other = ""
+                analyzed_fields.append(FieldInfo(field_name, field_type, field_extra_derive, analyzed_arg_type, field_type_class_path))
 
             repr = "#[repr(C)]\r\n"
-            if "repr" in structs_map[struct_name].keys():
-                repr = "#[repr(" + structs_map[struct_name]["repr"] + ")]\r\n"
-
-            code += indent_str + repr
-            code += opt_derive_debug + opt_derive_clone
-            code += opt_derive_other + opt_derive_copy
-            code += opt_derive_eq + opt_derive_ord
-            code += opt_derive_hash
-            code += opt_derive_default
-            code += opt_derive_serde
-            code += opt_derive_serde_extra_options
-            code += indent_str + "pub struct " + struct_name + " {\r\n"
-
-            for field in struct:
-                if type(field) is str:
-                    print("Struct " + struct_name + " should have a dictionary as fields")
-                field_name = list(field.keys())[0]
-                field_type = list(field.values())[0]
-                if "type" in field_type:
-                    field_type = field_type["type"]
-                    field_extra_derive = ""
-                    if "derive" in field[field_name].keys():
-                        field_extra_derive = field[field_name]["derive"] + "\r\n"
-                    code += field_extra_derive
-                    analyzed_arg_type = analyze_type(field_type)
-                    if is_primitive_arg(analyzed_arg_type[1]):
-                        if field_name == "ptr" and private_pointers:
-                            code += indent_str + "    " + "pub(crate) "
-                        else:
-                            code += indent_str + "    " + "pub "
-                        code += field_name + ": " + field_type + ",\r\n"
+            if "repr" in structs_map[struct_name]:
+                repr = f"#[repr({structs_map[struct_name]['repr']})]\r\n"
+
+            code.append(indent_str + repr)
+            code.append(opt_derive_debug + opt_derive_clone)
+            code.append(opt_derive_other + opt_derive_copy)
+            code.append(opt_derive_eq + opt_derive_ord)
+            code.append(opt_derive_hash)
+            code.append(opt_derive_default)
+            code.append(opt_derive_serde)
+            code.append(opt_derive_serde_extra_options)
+            code.append(f"{indent_str}pub struct {struct_name} {{\r\n")
+
+            for (field_name, field_type, field_extra_derive, analyzed_arg_type, field_type_class_path) in analyzed_fields:
+                code.append(field_extra_derive)
+                if field_type_class_path is None:
+                    if field_name == "ptr" and private_pointers:
+                        code.append(f"{indent_str}    pub(crate) ")
                     else:
-                        field_type_class_path = search_for_class_by_class_name(api_data, analyzed_arg_type[1])
-                        if field_type_class_path is None:
-                            print("no field_type_class_path found for " + str(analyzed_arg_type))
-
-                        found_c = get_class(api_data, field_type_class_path[0], field_type_class_path[1])
-                        if field_name == "ptr":
-                            code += indent_str + "    " + "pub(crate) "
-                        else:
-                            code += indent_str + "    " + "pub "
-                        field_postfix = wrapper_postfix
-                        prevent_wrapper_recursion = len(wrapper_postfix) != 0 and struct_name.endswith(wrapper_postfix)
-                        found_c_is_enum = "enum_fields" in found_c.keys()
-                        if (not(found_c_is_enum) or prevent_wrapper_recursion):
-                            field_postfix = ""
-                        code += field_name + ": " + analyzed_arg_type[0] + prefix + field_type_class_path[1] + field_postfix + analyzed_arg_type[2] + ",\r\n"
+                        code.append(f"{indent_str}    pub ")
+                    code.append(f"{field_name}: {field_type},\r\n")
                 else:
-                    print("struct " + struct_name + " does not have a type on field " + field_name)
-                    raise Exception("error")
-            code += indent_str + "}\r\n\r\n"
-        elif "enum" in struct.keys():
-            enum = struct["enum"]
+                    found_c = field_type_class_path[2]
+                    if field_name == "ptr":
+                        code.append(f"{indent_str}    pub(crate) ")
+                    else:
+                        code.append(f"{indent_str}    pub ")
+                    field_postfix = wrapper_postfix
+                    prevent_wrapper_recursion = len(wrapper_postfix) != 0 and struct_name.endswith(wrapper_postfix)
+                    found_c_is_enum = "enum_fields" in found_c
+                    if (not(found_c_is_enum) or prevent_wrapper_recursion):
+                        field_postfix = ""
+                    code.append(f"{field_name}: {analyzed_arg_type[0]}{prefix}{field_type_class_path[1]}{field_postfix}{analyzed_arg_type[2]},\r\n")
+            code.append(indent_str + "}\r\n\r\n")
+        elif "enum" in struct:
             repr = "#[repr(C)]\r\n"
 
-            for variant in enum:
-                variant_name = list(variant.keys())[0]
-                variant = list(variant.values())[0]
-                if "type" in variant.keys():
-                    repr = "#[repr(C, u8)]\r\n"
-
-            if "repr" in structs_map[struct_name].keys():
-                repr = "#[repr(" + structs_map[struct_name]["repr"] + ")]\r\n"
+            # analyze the variants once, used for the repr, the derives and the enum body
+            analyzed_variants = []
+            for (variant_name, variant) in iter_fields(struct_name, structs_map[struct_name], include_untyped=True):
+                if not("type" in variant):
+                    analyzed_variants.append(FieldInfo(variant_name, None, "", None, None))
+                    continue
+                repr = "#[repr(C, u8)]\r\n"
+                variant_type = variant["type"]
+                analyzed_arg_type = analyze_type(variant_type)
+                field_type_class_path = None
+                if not(is_primitive_arg(analyzed_arg_type[1])):
+                    field_type_class_path = resolve_class(api_data, analyzed_arg_type[1])
+                    if field_type_class_path is None:
+                        print("variant_type not found: " + variant_type + " in " + struct_name)
+                        raise Exception("error")
+                analyzed_variants.append(FieldInfo(variant_name, variant_type, "", analyzed_arg_type, field_type_class_path))
+
+            if "repr" in structs_map[struct_name]:
+                repr = f"#[repr({structs_map[struct_name]['repr']})]\r\n"
 
             # don't derive(Debug) for enums with function pointers in their variants
             opt_derive_debug = indent_str + "#[derive(Debug)]\r\n"
@@ -1135,157 +1161,129 @@ def generate_structs(api_data, structs_map, autoderive, indent = 4, private_poin
                 if class_implements_hash:
                     opt_derive_hash = indent_str + "#[derive(Hash)]\r\n"
 
-            for variant in enum:
-                variant = list(variant.values())[0]
-                if "type" in variant.keys():
-                    variant_type = variant["type"]
-                    analyzed_arg_type = analyze_type(variant_type)
-                    if not(is_primitive_arg(analyzed_arg_type[1])):
-                        field_type_class_path = search_for_class_by_class_name(api_data, analyzed_arg_type[1])
-                        if field_type_class_path is None:
-                            print("no field_type_class_path found for " + str(analyzed_arg_type))
-                        found_c = get_class(api_data, field_type_class_path[0], field_type_class_path[1])
-                        found_c_is_callback_typedef = "callback_typedef" in found_c.keys() and found_c["callback_typedef"]
-                        if found_c_is_callback_typedef:
-                            opt_derive_debug = ""
-                            opt_derive_other = ""
-
-            code += indent_str + repr
-            code += opt_derive_debug + opt_derive_clone
-            code += opt_derive_other + opt_derive_copy
-            code += opt_derive_ord + opt_derive_eq
-            code += opt_derive_hash
-            code += opt_derive_default
-            code += opt_derive_serde
-            code += opt_derive_serde_extra_options
-            code += indent_str + "pub enum " + struct_name + " {\r\n"
-
-            for variant in enum:
-                variant_name = list(variant.keys())[0]
-                variant = list(variant.values())[0]
-                if "type" in variant.keys():
-                    variant_type = variant["type"]
-                    if is_primitive_arg(variant_type):
-                        code += indent_str + "    " + variant_name + "(" + variant_type + "),\r\n"
-                    else:
-                        analyzed_arg_type = analyze_type(variant_type)
-                        if is_primitive_arg(analyzed_arg_type[1]):
-                            # array of [f32;x]
-                            code += indent_str + "    "  + variant_name + "(" + analyzed_arg_type[0] + analyzed_arg_type[1] + analyzed_arg_type[2] + "),\r\n"
-                        else:
-                            field_type_class_path = search_for_class_by_class_name(api_data, analyzed_arg_type[1])
-                            if field_type_class_path is None:
-                                print("variant_type not found: " + variant_type + " in " + struct_name)
-                            found_c = get_class(api_data, field_type_class_path[0], field_type_class_path[1])
-                            found_c_is_enum = "enum" in found_c.keys()
-                            variant_postfix = wrapper_postfix
-                            if not(found_c_is_enum):
-                                variant_postfix = ""
-                            code += indent_str + "    "  + variant_name + "(" + analyzed_arg_type[0] + prefix + field_type_class_path[1] + variant_postfix + analyzed_arg_type[2] + "),\r\n"
+            for variant in analyzed_variants:
+                if variant.class_path is not None:
+                    found_c = variant.class_path[2]
+                    found_c_is_callback_typedef = "callback_typedef" in found_c and found_c["callback_typedef"]
+                    if found_c_is_callback_typedef:
+                        opt_derive_debug = ""
+                        opt_derive_other = ""
+
+            code.append(indent_str + repr)
+            code.append(opt_derive_debug + opt_derive_clone)
+            code.append(opt_derive_other + opt_derive_copy)
+            code.append(opt_derive_ord + opt_derive_eq)
+            code.append(opt_derive_hash)
+            code.append(opt_derive_default)
+            code.append(opt_derive_serde)
+            code.append(opt_derive_serde_extra_options)
+            code.append(f"{indent_str}pub enum {struct_name} {{\r\n")
+
+            for (variant_name, variant_type, _, analyzed_arg_type, field_type_class_path) in analyzed_variants:
+                if variant_type is None:
+                    code.append(f"{indent_str}    {variant_name},\r\n")
+                elif is_primitive_arg(variant_type):
+                    code.append(f"{indent_str}    {variant_name}({variant_type}),\r\n")
+                elif field_type_class_path is None:
+                    # array of [f32;x]
+                    code.append(f"{indent_str}    {variant_name}({analyzed_arg_type[0]}{analyzed_arg_type[1]}{analyzed_arg_type[2]}),\r\n")
                 else:
-                    code += indent_str + "    "  + variant_name + ",\r\n"
-            code += indent_str + "}\r\n\r\n"
+                    found_c = field_type_class_path[2]
+                    found_c_is_enum = "enum" in found_c
+                    variant_postfix = wrapper_postfix
+                    if not(found_c_is_enum):
+                        variant_postfix = ""
+                    code.append(f"{indent_str}    {variant_name}({analyzed_arg_type[0]}{prefix}{field_type_class_path[1]}{variant_postfix}{analyzed_arg_type[2]}),\r\n")
+            code.append(indent_str + "}\r\n\r\n")
 
-    return code
+    return "".join(code)
 
 # returns the RUST DLL binding code
 def generate_rust_dll_bindings(api_data, structs_map, functions_map):
 
-    code = ""
-    code += read_file(root_folder + "/api/_patches/azul.rs/dll.rs")
-    code += "\r\n"
-
-    code += "    #[cfg(not(feature = \"link-static\"))]\r\n"
-    code += "    pub use self::dynamic_link::*;\r\n"
-    code += "    #[cfg(feature = \"link-static\")]\r\n"
-    code += "    pub use self::static_link::*;\r\n"
-    code += "    pub use self::types::*;\r\n"
-    code += "\r\n"
-
-    code += "    mod types {\r\n"
-    code += "        use core::ffi::c_void;\r\n\r\n"
-    code += generate_structs(api_data, structs_map, True, indent=8)
-    code += "    }\r\n\r\n"
-
-    code += "    #[cfg(feature = \"link-static\")]\r\n"
-    code += "    #[allow(non_snake_case)]\r\n"
-    code += "    mod static_link {\r\n"
-    code += "        use core::ffi::c_void;\r\n"
-    code += "        use core::mem::transmute;\r\n"
-    code += "        use super::types::*;\r\n\r\n"
-    for fn_name in functions_map.keys():
-        fn_type = functions_map[fn_name]
-        fn_args = fn_type[0]
-        fn_return = fn_type[1]
+    code = []
+    code.append(read_file(root_folder + "/api/_patches/azul.rs/dll.rs"))
+    code.append("\r\n")
+
+    code.append("    #[cfg(not(feature = \"link-static\"))]\r\n")
+    code.append("    pub use self::dynamic_link::*;\r\n")
+    code.append("    #[cfg(feature = \"link-static\")]\r\n")
+    code.append("    pub use self::static_link::*;\r\n")
+    code.append("    pub use self::types::*;\r\n\r\n")
+
+    code.append("    mod types {\r\n")
+    code.append("        use core::ffi::c_void;\r\n\r\n")
+    code.append(generate_structs(api_data, structs_map, True, indent=8))
+    code.append("    }\r\n\r\n")
+
+    code.append("    #[cfg(feature = \"link-static\")]\r\n")
+    code.append("    #[allow(non_snake_case)]\r\n")
+    code.append("    mod static_link {\r\n")
+    code.append("        use core::ffi::c_void;\r\n")
+    code.append("        use core::mem::transmute;\r\n")
+    code.append("        use super::types::*;\r\n\r\n")
+    for (fn_name, fn_args, fn_return) in functions_map:
         return_arrow = "" if fn_return == "" else " -> "
         fn_args_with_mem_transmute = strip_fn_arg_types_mem_transmute(fn_args)
-        code += "        pub(crate) fn " + fn_name + "(" + fn_args + ")" + return_arrow + fn_return + " { unsafe { transmute(azul::" + fn_name + "(" + fn_args_with_mem_transmute + ")) } }\r\n"
-    code += "    }\r\n\r\n"
-
-    code += "    #[cfg(not(feature = \"link-static\"))]\r\n"
-    code += "    mod dynamic_link {\r\n"
-    code += "        use core::ffi::c_void;\r\n\r\n"
-    code += "        use super::types::*;\r\n\r\n"
-    code += "        #[cfg_attr(target_os = \"windows\", link(name=\"azul.dll\"))] // https://github.com/rust-lang/cargo/issues/9082\r\n"
-    code += "        #[cfg_attr(not(target_os = \"windows\"), link(name=\"azul\"))] // https://github.com/rust-lang/cargo/issues/9082\r\n"
-    code += "        extern \"C\" {\r\n"
-    for fn_name in functions_map.keys():
-        fn_type = functions_map[fn_name]
-        fn_args = fn_type[0]
-        fn_return = fn_type[1]
+        code.append("        pub(crate) fn " + fn_name + "(" + fn_args + ")" + return_arrow + fn_return + " { unsafe { transmute(azul::" + fn_name + "(" + fn_args_with_mem_transmute + ")) } }\r\n")
+    code.append("    }\r\n\r\n")
+
+    code.append("    #[cfg(not(feature = \"link-static\"))]\r\n")
+    code.append("    mod dynamic_link {\r\n")
+    code.append("        use core::ffi::c_void;\r\n\r\n")
+    code.append("        use super::types::*;\r\n\r\n")
+    code.append("        #[cfg_attr(target_os = \"windows\", link(name=\"azul.dll\"))] // https://github.com/rust-lang/cargo/issues/9082\r\n")
+    code.append("        #[cfg_attr(not(target_os = \"windows\"), link(name=\"azul\"))] // https://github.com/rust-lang/cargo/issues/9082\r\n")
+    code.append("        extern \"C\" {\r\n")
+    for (fn_name, fn_args, fn_return) in functions_map:
         return_arrow = "" if fn_return == "" else " -> "
-        code += "            pub(crate) fn " + fn_name + "(" + strip_fn_arg_types(fn_args) + ")" + return_arrow + fn_return + ";\r\n"
-    code += "        }\r\n\r\n"
-    code += "    }\r\n\r\n"
+        code.append("            pub(crate) fn " + fn_name + "(" + strip_fn_arg_types(fn_args) + ")" + return_arrow + fn_return + ";\r\n")
+    code.append("        }\r\n\r\n")
+    code.append("    }\r\n\r\n")
 
-    code += "\r\n"
-    code += "\r\n"
+    code.append("\r\n\r\n")
 
-    return code
+    return "".join(code)
 
 # Generates the azul-dll/python.rs file (pyo3 bindings)
-def generate_python_api(api_data, structs_map, functions_map):
-
-    version = list(api_data.keys())[-1]
+def generate_python_api(api_data, version, structs_map, functions_map):
 
-    pyo3_code = ""
-    pyo3_code += "#![allow(non_snake_case)]\r\n"
-    pyo3_code += "\r\n"
-    pyo3_code += read_file(root_folder + "/api/_patches/azul-dll/header.rs")
-    pyo3_code += "\r\n"
-    pyo3_code += "use core::mem;\r\n"
-    pyo3_code += "use pyo3::prelude::*;\r\n"
-    pyo3_code += "use pyo3::PyObjectProtocol;\r\n"
-    pyo3_code += "use pyo3::types::*;\r\n"
-    pyo3_code += "use pyo3::exceptions::PyException;\r\n"
+    pyo3_code = io.StringIO()
+    pyo3_code.write("#![allow(non_snake_case)]\r\n\r\n")
+    pyo3_code.write(read_file(root_folder + "/api/_patches/azul-dll/header.rs"))
+    pyo3_code.write("\r\nuse core::mem;\r\n")
+    pyo3_code.write("use pyo3::prelude::*;\r\n")
+    pyo3_code.write("use pyo3::PyObjectProtocol;\r\n")
+    pyo3_code.write("use pyo3::types::*;\r\n")
+    pyo3_code.write("use pyo3::exceptions::PyException;\r\n")
 
     # This should be done properly, but right now it works
 
-    pyo3_code += "type GLuint = u32; type AzGLuint = GLuint;\r\n"
-    pyo3_code += "type GLint = i32; type AzGLint = GLint;\r\n"
-    pyo3_code += "type GLint64 = i64; type AzGLint64 = GLint64;\r\n"
-    pyo3_code += "type GLuint64 = u64; type AzGLuint64 = GLuint64;\r\n"
-    pyo3_code += "type GLenum = u32; type AzGLenum = GLenum;\r\n"
-    pyo3_code += "type GLintptr = isize; type AzGLintptr = GLintptr;\r\n"
-    pyo3_code += "type GLboolean = u8; type AzGLboolean = GLboolean;\r\n"
-    pyo3_code += "type GLsizeiptr = isize; type AzGLsizeiptr = GLsizeiptr;\r\n"
-    pyo3_code += "type GLvoid = c_void; type AzGLvoid = GLvoid;\r\n"
-    pyo3_code += "type GLbitfield = u32; type AzGLbitfield = GLbitfield;\r\n"
-    pyo3_code += "type GLsizei = i32; type AzGLsizei = GLsizei;\r\n"
-    pyo3_code += "type GLclampf = f32; type AzGLclampf = GLclampf;\r\n"
-    pyo3_code += "type GLfloat = f32; type AzGLfloat = GLfloat;\r\n"
-    pyo3_code += "type AzF32 = f32;\r\n"
-    pyo3_code += "type AzU16 = u16;\r\n"
-    pyo3_code += "type AzU32 = u32;\r\n"
-    pyo3_code += "type AzScanCode = u32;\r\n"
-
-    pyo3_code += "\r\n"
-    pyo3_code += "\r\n"
-    pyo3_code += read_file(root_folder + "/api/_patches/python/api.rs")
-    pyo3_code += "\r\n"
+    pyo3_code.write("type GLuint = u32; type AzGLuint = GLuint;\r\n")
+    pyo3_code.write("type GLint = i32; type AzGLint = GLint;\r\n")
+    pyo3_code.write("type GLint64 = i64; type AzGLint64 = GLint64;\r\n")
+    pyo3_code.write("type GLuint64 = u64; type AzGLuint64 = GLuint64;\r\n")
+    pyo3_code.write("type GLenum = u32; type AzGLenum = GLenum;\r\n")
+    pyo3_code.write("type GLintptr = isize; type AzGLintptr = GLintptr;\r\n")
+    pyo3_code.write("type GLboolean = u8; type AzGLboolean = GLboolean;\r\n")
+    pyo3_code.write("type GLsizeiptr = isize; type AzGLsizeiptr = GLsizeiptr;\r\n")
+    pyo3_code.write("type GLvoid = c_void; type AzGLvoid = GLvoid;\r\n")
+    pyo3_code.write("type GLbitfield = u32; type AzGLbitfield = GLbitfield;\r\n")
+    pyo3_code.write("type GLsizei = i32; type AzGLsizei = GLsizei;\r\n")
+    pyo3_code.write("type GLclampf = f32; type AzGLclampf = GLclampf;\r\n")
+    pyo3_code.write("type GLfloat = f32; type AzGLfloat = GLfloat;\r\n")
+    pyo3_code.write("type AzF32 = f32;\r\n")
+    pyo3_code.write("type AzU16 = u16;\r\n")
+    pyo3_code.write("type AzU32 = u32;\r\n")
+    pyo3_code.write("type AzScanCode = u32;\r\n")
+
+    pyo3_code.write("\r\n\r\n")
+    pyo3_code.write(read_file(root_folder + "/api/_patches/python/api.rs"))
+    pyo3_code.write("\r\n")
 
     # Functions that have to be implemented manually
-    manual_implementations = [
+    # (set: looked up for every constructor and function)
+    manual_implementations = {
 
         ("app", "App", "new"), # ok: replaced
         ("window", "WindowCreateOptions", "new"), # ok: replaced
@@ -1350,7 +1348,7 @@ def generate_python_api(api_data, structs_map, functions_map):
         ("callbacks", "RefAny", "new_c"), # unnecessary, use PyAny
         ("vec", "TesselatedSvgNodeVec", "as_ref_vec"),
         ("vec", "U8Vec", "as_ref_vec"),
-    ]
+    }
 
     inject_impls = {
         ("app", "App"): read_file(root_folder + "/api/_patches/python/app.rs"),
@@ -1478,20 +1476,20 @@ def generate_python_api(api_data, structs_map, functions_map):
     # pyo3 does not know how to translate enums
     # so we just create a "EnumWrapper" struct that
     # contains the internal type in rust-representation
-    for struct_name in list(structs_map.keys()):
+    for struct_name in structs_map:
         struct = structs_map[struct_name]
-        if "struct" in struct.keys():
+        if "struct" in struct:
             new_struct_map[struct_name]["extra_derive"] = "#[pyclass(name = \"" + struct_name[len(prefix):] + "\")]"
             field_index = 0
             for field in struct["struct"]:
-                field_name = list(field.keys())[0]
-                field_type = list(field.values())[0]["type"]
+                field_name = next(iter(field))
+                field_type = next(iter(field.values()))["type"]
                 if len(analyze_type(field_type)[0]) > 0:
                     raw_pointer_structs[struct_name] = {}
                 elif (not(field_name == "cb")):
                     new_struct_map[struct_name]["struct"][field_index][field_name]["extra_derive"] = "    #[pyo3(get, set)]"
                 field_index = field_index + 1
-        elif "enum" in struct.keys():
+        elif "enum" in struct:
             new_struct_map[struct_name + "EnumWrapper"] = {}
             new_struct_map[struct_name + "EnumWrapper"]["struct"] = []
             new_struct_map[struct_name + "EnumWrapper"]["struct"].append({})
@@ -1502,16 +1500,16 @@ def generate_python_api(api_data, structs_map, functions_map):
             new_struct_map[struct_name + "EnumWrapper"]["extra_derive"] = "#[pyclass(name = \"" + struct_name[len(prefix):] + "\")]"
 
             for variant in struct["enum"]:
-                variant_name = list(field.keys())[0]
-                variant = list(variant.values())[0]
-                if "type" in variant.keys():
+                variant_name = next(iter(field))
+                variant = next(iter(variant.values()))
+                if "type" in variant:
                     variant_type = variant["type"]
                     if len(analyze_type(variant_type)[0]) > 0:
                         raw_pointer_structs[struct_name] = {}
-        elif "callback_typedef" in struct.keys():
+        elif "callback_typedef" in struct:
             pass
 
-    pyo3_code += generate_structs(
+    pyo3_code.write(generate_structs(
         api_data[version],
         dict(new_struct_map),
         functions_map,
@@ -1519,84 +1517,81 @@ def generate_python_api(api_data, structs_map, functions_map):
         private_pointers=False,
         no_derive=True,
         wrapper_postfix="EnumWrapper"
-    )
+    ))
 
-    pyo3_code += "\r\n"
-    pyo3_code += "// Necessary because the Python interpreter may send structs across different threads"
-    pyo3_code += "\r\n"
-    for raw_pointer_struct in raw_pointer_structs.keys():
-        pyo3_code += "unsafe impl Send for " + raw_pointer_struct + " { }\r\n"
+    pyo3_code.write("\r\n// Necessary because the Python interpreter may send structs across different threads\r\n")
+    for raw_pointer_struct in raw_pointer_structs:
+        pyo3_code.write("unsafe impl Send for " + raw_pointer_struct + " { }\r\n")
 
-    pyo3_code += "\r\n"
+    pyo3_code.write("\r\n")
 
-    pyo3_code += "\r\n"
-    pyo3_code += "// Python objects must implement Clone at minimum"
-    pyo3_code += "\r\n"
-    for struct_name in list(structs_map.keys()):
+    pyo3_code.write("\r\n// Python objects must implement Clone at minimum\r\n")
+    for struct_name in structs_map:
         struct = structs_map[struct_name]
         clone_class = True
-        if "clone" in struct.keys():
+        if "clone" in struct:
             clone_class = struct["clone"]
         if not(clone_class):
             continue
 
-        if "struct" in struct.keys():
-            pyo3_code += "impl Clone for " + struct_name + " { fn clone(&self) -> Self { let r: &" + struct["external"]+ " = unsafe { mem::transmute(self) }; unsafe { mem::transmute(r.clone()) } } }\r\n"
-        elif "enum" in struct.keys():
-            pyo3_code += "impl Clone for " + struct_name + "EnumWrapper { fn clone(&self) -> Self { let r: &" + struct["external"]+ " = unsafe { mem::transmute(self) }; unsafe { mem::transmute(r.clone()) } } }\r\n"
+        if "struct" in struct:
+            impl_args = {"name": struct_name, "ptr_name": struct_name, "external": struct["external"]}
+            pyo3_code.write(python_impl_templates["Clone"].format_map(impl_args))
+        elif "enum" in struct:
+            impl_args = {"name": struct_name + "EnumWrapper", "ptr_name": struct_name, "external": struct["external"]}
+            pyo3_code.write(python_impl_templates["Clone"].format_map(impl_args))
 
-    pyo3_code += "\r\n"
-    pyo3_code += "// Implement Drop for all objects with drop constructors"
-    pyo3_code += "\r\n"
-    for struct_name in list(structs_map.keys()):
+    pyo3_code.write("\r\n// Implement Drop for all objects with drop constructors\r\n")
+    for struct_name in structs_map:
         struct = structs_map[struct_name]
-        class_has_custom_destructor = "custom_destructor" in struct.keys() and struct["custom_destructor"]
-        is_boxed_object = "is_boxed_object" in struct.keys() and struct["is_boxed_object"]
+        class_has_custom_destructor = "custom_destructor" in struct and struct["custom_destructor"]
+        is_boxed_object = "is_boxed_object" in struct and struct["is_boxed_object"]
         should_impl_drop = class_has_custom_destructor or is_boxed_object
 
         if should_impl_drop:
-            if "struct" in struct.keys():
-                pyo3_code += "impl Drop for " + struct_name + " { fn drop(&mut self) { crate::" + struct_name + "_delete(unsafe { mem::transmute(self) }); } }\r\n"
-            elif "enum" in struct.keys():
-                pyo3_code += "impl Drop for " + struct_name + "EnumWrapper { fn drop(&mut self) { crate::" + struct_name + "_delete(unsafe { mem::transmute(self) }); } }\r\n"
+            if "struct" in struct:
+                impl_args = {"name": struct_name, "ptr_name": struct_name}
+                pyo3_code.write(python_impl_templates["Drop"].format_map(impl_args))
+            elif "enum" in struct:
+                impl_args = {"name": struct_name + "EnumWrapper", "ptr_name": struct_name}
+                pyo3_code.write(python_impl_templates["Drop"].format_map(impl_args))
 
-    pyo3_code += "\r\n"
+    pyo3_code.write("\r\n")
 
     # List of types that are returned as errors, have to implement py03::Error
     errlist = []
 
-    for module_name in api_data[version].keys():
+    for module_name in api_data[version]:
         module = api_data[version][module_name]
-        for class_name in module["classes"].keys():
+        for class_name in module["classes"]:
             struct = module["classes"][class_name]
 
             constants = ""
-            if "constants" in struct.keys():
+            if "constants" in struct:
                 for constant in struct["constants"]:
-                    constant_name = list(constant.keys())[0]
+                    constant_name = next(iter(constant))
                     constant_type = constant[constant_name]["type"]
                     constant_value = constant[constant_name]["value"]
                     constants += "    #[classattr]\r\n    const " + constant_name + ": " + constant_type + " = " + constant_value + ";\r\n"
                 constants += "\r\n"
 
-            if "struct_fields" in struct.keys():
+            if "struct_fields" in struct:
 
-                pyo3_code += "\r\n"
-                pyo3_code += "#[pymethods]\r\n"
-                pyo3_code += "impl " + prefix + class_name + " {\r\n" + constants
+                pyo3_code.write("\r\n#[pymethods]\r\n")
+                pyo3_code.write("impl " + prefix + class_name + " {\r\n" + constants)
                 external = struct["external"]
 
-                if "constructors" in struct.keys():
+                if "constructors" in struct:
                     for constructor_name in struct["constructors"]:
                         if (module_name, class_name, constructor_name) in manual_implementations:
                             continue
                         constructor = struct["constructors"][constructor_name]
-                        if not("fn_args" in constructor.keys()):
+                        if not("fn_args" in constructor):
                             print("wrong format: constructor " + class_name + "::" + constructor_name)
                         fn_args = constructor["fn_args"]
                         break_outer_flag = False
                         for f in fn_args:
-                            arg_name = list(f.keys())[0]
+                            arg_name = next(iter(f))
                             arg_type = f[arg_name]
                             analyzed = analyze_type(arg_type)
                             if len(analyzed[0]) != 0 or arg_type == "RefAny":
@@ -1610,7 +1605,7 @@ def generate_python_api(api_data, structs_map, functions_map):
                         return_type_match = ""
                         returns_option = None
                         returns_error = None
-                        if "returns" in constructor.keys():
+                        if "returns" in constructor:
                             return_type_match = constructor["returns"]["type"]
                             r = format_py_return(python_replacements, constructor["returns"], api_data[version], errlist, constructor=True)
                             return_type = r[0]
@@ -1619,18 +1614,18 @@ def generate_python_api(api_data, structs_map, functions_map):
                         return_type_str = prefix + class_name
                         if not(return_type is None):
                             return_type_str = return_type
-                        if (constructor_name == "new" and not("returns" in constructor.keys())):
-                            pyo3_code += "    #[new]\r\n"
+                        if (constructor_name == "new" and not("returns" in constructor)):
+                            pyo3_code.write("    #[new]\r\n")
                         else:
-                            pyo3_code += "    #[staticmethod]\r\n"
-                        pyo3_code += "    fn " + constructor_name + "(" + py_args + ") -> " + return_type_str + " {\r\n"
-                        pyo3_code += "        " + format_py_body(python_replacements, module_name, class_name, constructor_name, fn_args, api_data[version], return_type_match, returns_option, returns_error, constructor=True) + "\r\n"
-                        pyo3_code += "    }\r\n"
+                            pyo3_code.write("    #[staticmethod]\r\n")
+                        pyo3_code.write("    fn " + constructor_name + "(" + py_args + ") -> " + return_type_str + " {\r\n")
+                        pyo3_code.write("        " + format_py_body(python_replacements, module_name, class_name, constructor_name, fn_args, api_data[version], return_type_match, returns_option, returns_error, constructor=True) + "\r\n")
+                        pyo3_code.write("    }\r\n")
 
                 # Generate constructors
                 class_is_vec = class_name.endswith("Vec")
                 while True:
-                    if (not("constructors") in struct.keys() or len(struct["constructors"]) == 0) and not(class_name in not_default_constructable.keys()):
+                    if (not("constructors") in struct or len(struct["constructors"]) == 0) and not(class_name in not_default_constructable):
                         py_new_constructor = ""
                         py_func_args = ""
 
@@ -1641,7 +1636,7 @@ def generate_python_api(api_data, structs_map, functions_map):
                         is_ref_struct = False
 
                         for field in struct["struct_fields"]:
-                            field_name = list(field.keys())[0]
+                            field_name = next(iter(field))
                             if field_name == "ptr":
                                 if maybe_is_ref_struct:
                                     is_ref_struct = True
@@ -1655,10 +1650,10 @@ def generate_python_api(api_data, structs_map, functions_map):
                                 py_new_constructor += "            " + field_name + ",\r\n"
                             else:
                                 f_class = quick_get_class(api_data[version], analyzed_type[1])
-                                if "enum_fields" in f_class.keys():
+                                if "enum_fields" in f_class:
                                     py_func_args += field_name + ": " + prefix + field_type + "EnumWrapper, "
                                     py_new_constructor += "            " + field_name + ",\r\n"
-                                elif "struct_fields" in f_class.keys():
+                                elif "struct_fields" in f_class:
                                     py_func_args += field_name + ": " + prefix + field_type + ", "
                                     py_new_constructor += "            " + field_name + ",\r\n"
                                 else:
@@ -1675,41 +1670,41 @@ def generate_python_api(api_data, structs_map, functions_map):
                             vec_ty_excluded = ["ScanCode", "U16", "U32", "I32", "F32", "GLuint", "GLint"]
                             if not(vec_type in vec_ty_excluded):
                                 vec_class = quick_get_class(api_data[version], vec_type)
-                                if "enum_fields" in vec_class.keys():
+                                if "enum_fields" in vec_class:
                                     vec_type = vec_type + "EnumWrapper"
-                            pyo3_code += "    /// Creates a new `" + vec_type + "Vec` from a Python array\r\n"
-                            pyo3_code += "    #[new]\r\n"
-                            pyo3_code += "    fn __new__(input: Vec<" + prefix + vec_type + ">) -> Self {\r\n"
-                            pyo3_code += "        let m: " + external + " = " + external + "::from_vec(unsafe { mem::transmute(input) }); unsafe { mem::transmute(m) }\r\n"
-
-                            pyo3_code += "    }\r\n"
-                            pyo3_code += "    \r\n"
-                            pyo3_code += "    /// Returns the " + vec_type + " as a Python array\r\n"
-                            pyo3_code += "    fn array(&self) -> Vec<" + prefix + vec_type + "> {\r\n"
-                            pyo3_code += "        let m: &" + external + " = unsafe { mem::transmute(self) }; unsafe { mem::transmute(m.clone().into_library_owned_vec()) }\r\n"
-                            pyo3_code += "    }\r\n"
+                            pyo3_code.write("    /// Creates a new `" + vec_type + "Vec` from a Python array\r\n")
+                            pyo3_code.write("    #[new]\r\n")
+                            pyo3_code.write("    fn __new__(input: Vec<" + prefix + vec_type + ">) -> Self {\r\n")
+                            pyo3_code.write("        let m: " + external + " = " + external + "::from_vec(unsafe { mem::transmute(input) }); unsafe { mem::transmute(m) }\r\n")
+
+                            pyo3_code.write("    }\r\n")
+                            pyo3_code.write("    \r\n")
+                            pyo3_code.write("    /// Returns the " + vec_type + " as a Python array\r\n")
+                            pyo3_code.write("    fn array(&self) -> Vec<" + prefix + vec_type + "> {\r\n")
+                            pyo3_code.write("        let m: &" + external + " = unsafe { mem::transmute(self) }; unsafe { mem::transmute(m.clone().into_library_owned_vec()) }\r\n")
+                            pyo3_code.write("    }\r\n")
                         else:
-                            pyo3_code += "    #[new]\r\n"
-                            pyo3_code += "    fn __new__(" + py_func_args + ") -> Self {\r\n"
-                            pyo3_code += "        Self {\r\n"
-                            pyo3_code += py_new_constructor
-                            pyo3_code += "        }\r\n"
-                            pyo3_code += "    }\r\n"
-                        pyo3_code += "\r\n"
+                            pyo3_code.write("    #[new]\r\n")
+                            pyo3_code.write("    fn __new__(" + py_func_args + ") -> Self {\r\n")
+                            pyo3_code.write("        Self {\r\n")
+                            pyo3_code.write(py_new_constructor)
+                            pyo3_code.write("        }\r\n")
+                            pyo3_code.write("    }\r\n")
+                        pyo3_code.write("\r\n")
 
                     break
 
-                if "functions" in struct.keys():
+                if "functions" in struct:
                     for function_name in struct["functions"]:
                         function = struct["functions"][function_name]
                         if (module_name, class_name, function_name) in manual_implementations:
                             continue
-                        if not("fn_args" in function.keys()):
+                        if not("fn_args" in function):
                             print("wrong format: " + class_name + "::" + function_name)
                         fn_args = function["fn_args"]
                         break_outer_flag = False
                         for f in fn_args:
-                            arg_name = list(f.keys())[0]
+                            arg_name = next(iter(f))
                             arg_type = f[arg_name]
                             analyzed = analyze_type(arg_type)
                             if len(analyzed[0]) != 0 or arg_type == "RefAny":
@@ -1729,7 +1724,7 @@ def generate_python_api(api_data, structs_map, functions_map):
                         return_type_match = ""
                         returns_option = None
                         returns_error = None
-                        if "returns" in function.keys():
+                        if "returns" in function:
                             return_type_match = function["returns"]["type"]
                             r = format_py_return(python_replacements, function["returns"], api_data[version], errlist, constructor=False)
                             return_type = r[0]
@@ -1738,30 +1733,28 @@ def generate_python_api(api_data, structs_map, functions_map):
                         return_type_str = "()"
                         if not(return_type is None):
                             return_type_str = return_type
-                        pyo3_code += "    fn " + function_name + "(" + self_arg + format_py_args(python_replacements, fn_args, api_data[version], constructor=False) + ") -> " + return_type_str + " {\r\n"
-                        pyo3_code += "        " + format_py_body(python_replacements, module_name, class_name, function_name, fn_args, api_data[version], return_type_match, returns_option, returns_error, constructor=False) + "\r\n"
-                        pyo3_code += "    }\r\n"
-
-
-                if tuple((module_name, class_name)) in inject_impls:
-                    pyo3_code += inject_impls[tuple((module_name, class_name))]
-                pyo3_code += "}\r\n"
-
-                pyo3_code += "\r\n"
-                pyo3_code += "#[pyproto]\r\n"
-                pyo3_code += "impl PyObjectProtocol for " + prefix + class_name + " {\r\n"
-                pyo3_code += "    fn __str__(&self) -> Result<String, PyErr> { \r\n"
-                pyo3_code += "        let m: &" + external + " = unsafe { mem::transmute(self) }; Ok(format!(\"{:#?}\", m))\r\n"
-                pyo3_code += "    }\r\n"
-                pyo3_code += "    fn __repr__(&self) -> Result<String, PyErr> { \r\n"
-                pyo3_code += "        let m: &" + external + " = unsafe { mem::transmute(self) }; Ok(format!(\"{:#?}\", m))\r\n"
-                pyo3_code += "    }\r\n"
-                pyo3_code += "}\r\n"
-
-            elif "enum_fields" in struct.keys():
-                pyo3_code += "\r\n"
-                pyo3_code += "#[pymethods]\r\n"
-                pyo3_code += "impl " + prefix + class_name + "EnumWrapper {\r\n" + constants
+                        pyo3_code.write("    fn " + function_name + "(" + self_arg + format_py_args(python_replacements, fn_args, api_data[version], constructor=False) + ") -> " + return_type_str + " {\r\n")
+                        pyo3_code.write("        " + format_py_body(python_replacements, module_name, class_name, function_name, fn_args, api_data[version], return_type_match, returns_option, returns_error, constructor=False) + "\r\n")
+                        pyo3_code.write("    }\r\n")
+
+
+                if (module_name, class_name) in inject_impls:
+                    pyo3_code.write(inject_impls[(module_name, class_name)])
+                pyo3_code.write("}\r\n")
+
+                pyo3_code.write("\r\n#[pyproto]\r\n")
+                pyo3_code.write("impl PyObjectProtocol for " + prefix + class_name + " {\r\n")
+                pyo3_code.write("    fn __str__(&self) -> Result<String, PyErr> { \r\n")
+                pyo3_code.write("        let m: &" + external + " = unsafe { mem::transmute(self) }; Ok(format!(\"{:#?}\", m))\r\n")
+                pyo3_code.write("    }\r\n")
+                pyo3_code.write("    fn __repr__(&self) -> Result<String, PyErr> { \r\n")
+                pyo3_code.write("        let m: &" + external + " = unsafe { mem::transmute(self) }; Ok(format!(\"{:#?}\", m))\r\n")
+                pyo3_code.write("    }\r\n")
+                pyo3_code.write("}\r\n")
+
+            elif "enum_fields" in struct:
+                pyo3_code.write("\r\n#[pymethods]\r\n")
+                pyo3_code.write("impl " + prefix + class_name + "EnumWrapper {\r\n" + constants)
 
                 enum_is_union = False
 
@@ -1770,9 +1763,9 @@ def generate_python_api(api_data, structs_map, functions_map):
                     enum_arg_type = ""
                     enum_type = ""
                     needs_transmute = False
-                    variant_name = list(enum_name.keys())[0]
+                    variant_name = next(iter(enum_name))
                     variant = enum_name[variant_name]
-                    if "type" in variant.keys():
+                    if "type" in variant:
                         enum_is_union = True
                         analyzed_type = analyze_type(variant["type"])
                         if (len(analyzed_type[0]) > 0):
@@ -1780,10 +1773,10 @@ def generate_python_api(api_data, structs_map, functions_map):
                         enum_arg_type = "v: " + analyzed_type[1]
                         if not(is_primitive_arg(analyzed_type[1])):
                             e_class = quick_get_class(api_data[version], analyzed_type[1])
-                            if "enum_fields" in e_class.keys():
+                            if "enum_fields" in e_class:
                                 enum_arg_type = "v: " + prefix + analyzed_type[1] + "EnumWrapper"
                                 needs_transmute = True
-                            elif "struct_fields" in e_class.keys():
+                            elif "struct_fields" in e_class:
                                 enum_arg_type = "v: " + prefix + analyzed_type[1]
                             else:
                                 continue # cannot construct callbacks as function arguments
@@ -1791,45 +1784,44 @@ def generate_python_api(api_data, structs_map, functions_map):
                              enum_arg_type = "v: " + analyzed_type[1]
                         enum_type = enum_arg_type
                     if not(len(enum_type) == 0):
-                        pyo3_code += "    #[staticmethod]\r\n    fn " + variant_name + "(" + enum_arg_type + ") -> "
+                        pyo3_code.write("    #[staticmethod]\r\n    fn " + variant_name + "(" + enum_arg_type + ") -> ")
                     else:
-                        pyo3_code += "    #[classattr]\r\n    fn " + variant_name + "(" + enum_arg_type + ") -> "
-                    pyo3_code += prefix + class_name + "EnumWrapper { "
-                    pyo3_code += prefix + class_name + "EnumWrapper { inner: " + prefix + class_name + "::" + variant_name
+                        pyo3_code.write("    #[classattr]\r\n    fn " + variant_name + "(" + enum_arg_type + ") -> ")
+                    pyo3_code.write(prefix + class_name + "EnumWrapper { ")
+                    pyo3_code.write(prefix + class_name + "EnumWrapper { inner: " + prefix + class_name + "::" + variant_name)
                     if not(len(enum_type) == 0):
                         if needs_transmute:
-                            pyo3_code += "(unsafe { mem::transmute(v) })"
+                            pyo3_code.write("(unsafe { mem::transmute(v) })")
                         else:
-                            pyo3_code += "(v)"
-                    pyo3_code += " } }\r\n"
+                            pyo3_code.write("(v)")
+                    pyo3_code.write(" } }\r\n")
 
-                if tuple((module_name, class_name)) in inject_impls:
-                    pyo3_code += inject_impls[tuple((module_name, class_name))]
+                if (module_name, class_name) in inject_impls:
+                    pyo3_code.write(inject_impls[(module_name, class_name)])
 
                 # Generate a "match" function that returns the enum tag as a string + the object as a tuple
                 if enum_is_union:
-                    pyo3_code += "\r\n"
-                    pyo3_code += "    fn r#match(&self) -> PyResult<Vec<PyObject>> {\r\n"
-                    pyo3_code += "        use crate::python::" + prefix + class_name + ";\r\n"
-                    pyo3_code += "        use pyo3::conversion::IntoPy;\r\n"
-                    pyo3_code += "        let gil = Python::acquire_gil();\r\n"
-                    pyo3_code += "        let py = gil.python();\r\n"
-                    pyo3_code += "        match &self.inner {\r\n"
+                    pyo3_code.write("\r\n    fn r#match(&self) -> PyResult<Vec<PyObject>> {\r\n")
+                    pyo3_code.write("        use crate::python::" + prefix + class_name + ";\r\n")
+                    pyo3_code.write("        use pyo3::conversion::IntoPy;\r\n")
+                    pyo3_code.write("        let gil = Python::acquire_gil();\r\n")
+                    pyo3_code.write("        let py = gil.python();\r\n")
+                    pyo3_code.write("        match &self.inner {\r\n")
                     for enum_name in struct["enum_fields"]:
-                        variant_name = list(enum_name.keys())[0]
+                        variant_name = next(iter(enum_name))
                         variant = enum_name[variant_name]
                         opt_variant_type_match = ""
-                        if "type" in variant.keys():
+                        if "type" in variant:
                             opt_variant_type_match = "(v)"
                         opt_variant_value = "()"
-                        if "type" in variant.keys():
-                            if (variant["type"] == "*const c_void") or (variant["type"] == "*mut c_void"):
+                        if "type" in variant:
+                            if variant["type"] in ("*const c_void", "*mut c_void"):
                                 opt_variant_value = "()"
                             else:
                                 analyzed_type = analyze_type(variant["type"])
                                 if not(is_primitive_arg(analyzed_type[1])):
                                     e_class = quick_get_class(api_data[version], analyzed_type[1])
-                                    if "enum_fields" in e_class.keys():
+                                    if "enum_fields" in e_class:
                                         opt_variant_value = "{ let m: &" + prefix + analyzed_type[1] + "EnumWrapper = unsafe { mem::transmute(v) }; m.clone() }"
                                     elif class_is_typedef(e_class):
                                         opt_variant_value = "()" # can't destructure function pointer
@@ -1840,71 +1832,66 @@ def generate_python_api(api_data, structs_map, functions_map):
                                 else:
                                         opt_variant_value = "v"
 
-                        pyo3_code += "            " + prefix + class_name + "::" + variant_name + opt_variant_type_match + " => Ok(vec![\"" + variant_name + "\".into_py(py), " + opt_variant_value + ".into_py(py)]),\r\n"
-                    pyo3_code += "        }\r\n"
-                    pyo3_code += "    }\r\n"
+                        pyo3_code.write("            " + prefix + class_name + "::" + variant_name + opt_variant_type_match + " => Ok(vec![\"" + variant_name + "\".into_py(py), " + opt_variant_value + ".into_py(py)]),\r\n")
+                    pyo3_code.write("        }\r\n")
+                    pyo3_code.write("    }\r\n")
 
-                pyo3_code += "}\r\n"
+                pyo3_code.write("}\r\n")
 
                 external = struct["external"]
-                pyo3_code += "\r\n"
-                pyo3_code += "#[pyproto]\r\n"
-                pyo3_code += "impl PyObjectProtocol for " + prefix + class_name + "EnumWrapper {\r\n"
-                pyo3_code += "    fn __str__(&self) -> Result<String, PyErr> { \r\n"
-                pyo3_code += "        let m: &" + external + " = unsafe { mem::transmute(&self.inner) }; Ok(format!(\"{:#?}\", m))\r\n"
-                pyo3_code += "    }\r\n"
-                pyo3_code += "    fn __repr__(&self) -> Result<String, PyErr> { \r\n"
-                pyo3_code += "        let m: &" + external + " = unsafe { mem::transmute(&self.inner) }; Ok(format!(\"{:#?}\", m))\r\n"
-                pyo3_code += "    }\r\n"
+                pyo3_code.write("\r\n#[pyproto]\r\n")
+                pyo3_code.write("impl PyObjectProtocol for " + prefix + class_name + "EnumWrapper {\r\n")
+                pyo3_code.write("    fn __str__(&self) -> Result<String, PyErr> { \r\n")
+                pyo3_code.write("        let m: &" + external + " = unsafe { mem::transmute(&self.inner) }; Ok(format!(\"{:#?}\", m))\r\n")
+                pyo3_code.write("    }\r\n")
+                pyo3_code.write("    fn __repr__(&self) -> Result<String, PyErr> { \r\n")
+                pyo3_code.write("        let m: &" + external + " = unsafe { mem::transmute(&self.inner) }; Ok(format!(\"{:#?}\", m))\r\n")
+                pyo3_code.write("    }\r\n")
 
                 # simple C-like enum: implement comparison operators
                 if not(enum_is_union):
-                    pyo3_code += "    fn __richcmp__(&self, other: " + prefix + class_name + "EnumWrapper, op: pyo3::class::basic::CompareOp) -> PyResult<bool> {\r\n"
-                    pyo3_code += "        match op {\r\n"
-                    pyo3_code += "            pyo3::class::basic::CompareOp::Lt => { Ok((self.clone().inner as usize) <  (other.clone().inner as usize)) }\r\n"
-                    pyo3_code += "            pyo3::class::basic::CompareOp::Le => { Ok((self.clone().inner as usize) <= (other.clone().inner as usize)) }\r\n"
-                    pyo3_code += "            pyo3::class::basic::CompareOp::Eq => { Ok((self.clone().inner as usize) == (other.clone().inner as usize)) }\r\n"
-                    pyo3_code += "            pyo3::class::basic::CompareOp::Ne => { Ok((self.clone().inner as usize) != (other.clone().inner as usize)) }\r\n"
-                    pyo3_code += "            pyo3::class::basic::CompareOp::Gt => { Ok((self.clone().inner as usize) >  (other.clone().inner as usize)) }\r\n"
-                    pyo3_code += "            pyo3::class::basic::CompareOp::Ge => { Ok((self.clone().inner as usize) >= (other.clone().inner as usize)) }\r\n"
-                    pyo3_code += "        }\r\n"
-                    pyo3_code += "    }\r\n"
-
-                pyo3_code += "}\r\n"
+                    pyo3_code.write("    fn __richcmp__(&self, other: " + prefix + class_name + "EnumWrapper, op: pyo3::class::basic::CompareOp) -> PyResult<bool> {\r\n")
+                    pyo3_code.write("        match op {\r\n")
+                    pyo3_code.write("            pyo3::class::basic::CompareOp::Lt => { Ok((self.clone().inner as usize) <  (other.clone().inner as usize)) }\r\n")
+                    pyo3_code.write("            pyo3::class::basic::CompareOp::Le => { Ok((self.clone().inner as usize) <= (other.clone().inner as usize)) }\r\n")
+                    pyo3_code.write("            pyo3::class::basic::CompareOp::Eq => { Ok((self.clone().inner as usize) == (other.clone().inner as usize)) }\r\n")
+                    pyo3_code.write("            pyo3::class::basic::CompareOp::Ne => { Ok((self.clone().inner as usize) != (other.clone().inner as usize)) }\r\n")
+                    pyo3_code.write("            pyo3::class::basic::CompareOp::Gt => { Ok((self.clone().inner as usize) >  (other.clone().inner as usize)) }\r\n")
+                    pyo3_code.write("            pyo3::class::basic::CompareOp::Ge => { Ok((self.clone().inner as usize) >= (other.clone().inner as usize)) }\r\n")
+                    pyo3_code.write("        }\r\n")
+                    pyo3_code.write("    }\r\n")
+
+                pyo3_code.write("}\r\n")
 
     errlist_dict = {}
     for err in errlist:
         errlist_dict[err] = {}
 
-    pyo3_code += "\r\n"
-    for err in errlist_dict.keys():
+    pyo3_code.write("\r\n")
+    for err in errlist_dict:
         external = structs_map[err]["external"]
-        pyo3_code += "\r\n"
-        pyo3_code += "impl core::convert::From<" + err + "> for PyErr {\r\n"
-        pyo3_code += "    fn from(err: " + err + ") -> PyErr {\r\n"
-        pyo3_code += "        let r: " + external + " = unsafe { mem::transmute(err) };\r\n"
-        pyo3_code += "        PyException::new_err(format!(\"{}\", r))\r\n"
-        pyo3_code += "    }\r\n"
-        pyo3_code += "}\r\n"
-
-    pyo3_code += "\r\n"
-    pyo3_code += "#[pymodule]\r\n"
-    pyo3_code += "fn azul(py: Python, m: &PyModule) -> PyResult<()> {\r\n"
-    pyo3_code += "\r\n"
-    pyo3_code += "    #[cfg(all(feature = \"use_pyo3_logger\", not(feature = \"use_fern_logger\")))] {\r\n"
+        pyo3_code.write("\r\n")
+        pyo3_code.write("impl core::convert::From<" + err + "> for PyErr {\r\n")
+        pyo3_code.write("    fn from(err: " + err + ") -> PyErr {\r\n")
+        pyo3_code.write("        let r: " + external + " = unsafe { mem::transmute(err) };\r\n")
+        pyo3_code.write("        PyException::new_err(format!(\"{}\", r))\r\n")
+        pyo3_code.write("    }\r\n")
+        pyo3_code.write("}\r\n")
+
+    pyo3_code.write("\r\n#[pymodule]\r\n")
+    pyo3_code.write("fn azul(py: Python, m: &PyModule) -> PyResult<()> {\r\n\r\n")
+    pyo3_code.write("    #[cfg(all(feature = \"use_pyo3_logger\", not(feature = \"use_fern_logger\")))] {\r\n")
 
     # Since we can't get access to the AppConfig
     # here, use environment variables for configuration
 
-    pyo3_code += "        let mut filter = log::LevelFilter ::Warn;\r\n"
-    pyo3_code += "\r\n"
-    pyo3_code += "        if std::env::var(\"AZUL_PY_LOGLEVEL_ERROR\").is_ok() { filter = log::LevelFilter ::Error; }\r\n"
-    pyo3_code += "        if std::env::var(\"AZUL_PY_LOGLEVEL_WARN\").is_ok() { filter = log::LevelFilter ::Warn; }\r\n"
-    pyo3_code += "        if std::env::var(\"AZUL_PY_LOGLEVEL_INFO\").is_ok() { filter = log::LevelFilter ::Info; }\r\n"
-    pyo3_code += "        if std::env::var(\"AZUL_PY_LOGLEVEL_DEBUG\").is_ok() { filter = log::LevelFilter ::Debug; }\r\n"
-    pyo3_code += "        if std::env::var(\"AZUL_PY_LOGLEVEL_TRACE\").is_ok() { filter = log::LevelFilter ::Trace; }\r\n"
-    pyo3_code += "        if std::env::var(\"AZUL_PY_LOGLEVEL_OFF\").is_ok() { filter = log::LevelFilter ::Off; }\r\n"
-    pyo3_code += "\r\n"
+    pyo3_code.write("        let mut filter = log::LevelFilter ::Warn;\r\n\r\n")
+    pyo3_code.write("        if std::env::var(\"AZUL_PY_LOGLEVEL_ERROR\").is_ok() { filter = log::LevelFilter ::Error; }\r\n")
+    pyo3_code.write("        if std::env::var(\"AZUL_PY_LOGLEVEL_WARN\").is_ok() { filter = log::LevelFilter ::Warn; }\r\n")
+    pyo3_code.write("        if std::env::var(\"AZUL_PY_LOGLEVEL_INFO\").is_ok() { filter = log::LevelFilter ::Info; }\r\n")
+    pyo3_code.write("        if std::env::var(\"AZUL_PY_LOGLEVEL_DEBUG\").is_ok() { filter = log::LevelFilter ::Debug; }\r\n")
+    pyo3_code.write("        if std::env::var(\"AZUL_PY_LOGLEVEL_TRACE\").is_ok() { filter = log::LevelFilter ::Trace; }\r\n")
+    pyo3_code.write("        if std::env::var(\"AZUL_PY_LOGLEVEL_OFF\").is_ok() { filter = log::LevelFilter ::Off; }\r\n\r\n")
 
     # pyo3_code += "        match pyo3_log::Logger::new(py.clone(), pyo3_log::Caching::LoggersAndLevels) {\r\n"
     # pyo3_code += "            Ok(o) => {\r\n"
@@ -1917,34 +1904,32 @@ def generate_python_api(api_data, structs_map, functions_map):
     # pyo3_code += "        }\r\n"
 
     # pyo3_code += "        pyo3_log::init();\r\n"
-    pyo3_code += "    }\r\n"
-    pyo3_code += "\r\n"
+    pyo3_code.write("    }\r\n\r\n")
 
-    for module_name in api_data[version].keys():
+    for module_name in api_data[version]:
         module = api_data[version][module_name]
-        for class_name in module["classes"].keys():
+        for class_name in module["classes"]:
             struct = module["classes"][class_name]
-            if "struct_fields" in struct.keys():
-                pyo3_code += "    m.add_class::<" + prefix + class_name + ">()?;\r\n"
-            elif "enum_fields" in struct.keys():
-                pyo3_code += "    m.add_class::<" + prefix + class_name + "EnumWrapper>()?;\r\n"
+            if "struct_fields" in struct:
+                pyo3_code.write("    m.add_class::<" + prefix + class_name + ">()?;\r\n")
+            elif "enum_fields" in struct:
+                pyo3_code.write("    m.add_class::<" + prefix + class_name + "EnumWrapper>()?;\r\n")
                 pass
-            elif "callback_typedef" in struct.keys():
+            elif "callback_typedef" in struct:
                 pass
-        pyo3_code += "\r\n"
-    pyo3_code += "    Ok(())\r\n"
-    pyo3_code += "}\r\n"
-    pyo3_code += "\r\n"
-    return pyo3_code
+        pyo3_code.write("\r\n")
+    pyo3_code.write("    Ok(())\r\n")
+    pyo3_code.write("}\r\n\r\n")
+    return pyo3_code.getvalue()
 
 # Formats the input function arguments for the python DLL
 def format_py_args(python_replacements, fn_args, api_data, constructor=False):
 
-    fn_args_string = ""
+    fn_args_string = []
 
     # if the argument is a AzString, use a String instead
     for f in fn_args:
-        f_name = list(f.keys())[0]
+        f_name = next(iter(f))
         if f_name == "self":
             continue
         f_type = f[f_name]
@@ -1963,11 +1948,11 @@ def format_py_args(python_replacements, fn_args, api_data, constructor=False):
             f_real_type = ref + f_type
         else:
             f_class = quick_get_class(api_data, analyzed_fn_type[1])
-            if "enum_fields" in f_class.keys():
+            if "enum_fields" in f_class:
                 f_real_type = ref + prefix + f_type + "EnumWrapper"
-            elif "struct_fields" in f_class.keys():
+            elif "struct_fields" in f_class:
                 f_real_type = ref + prefix + f_type
-                if f_type in python_replacements.keys():
+                if f_type in python_replacements:
                     py_replace = python_replacements[f_type][0]
                     if py_replace.startswith("mut "):
                         f_real_mut = "mut "
@@ -1977,15 +1962,12 @@ def format_py_args(python_replacements, fn_args, api_data, constructor=False):
             else:
                 raise Exception("cannot use type " + f_name + ": " + f_type + " as a Python function argument")
 
-        fn_args_string += f_real_mut + f_name + ": " + f_real_type + ", "
-
-    if not(len(fn_args_string) == 0):
-        fn_args_string = fn_args_string[:-2]
+        fn_args_string.append(f_real_mut + f_name + ": " + f_real_type)
 
     if (not(constructor) and not(len(fn_args_string) == 0)):
-        fn_args_string = ", " + fn_args_string
+        return ", " + ", ".join(fn_args_string)
 
-    return fn_args_string
+    return ", ".join(fn_args_string)
 
 # Formats the return type for the python DLL
 # returns the (return type, class_is_option, class_throws)
@@ -1994,13 +1976,13 @@ def format_py_return(python_replacements, return_type, api_data, errlist, constr
         found_c = quick_get_class(api_data, return_type["type"])
         ret_type_ok = found_c["enum_fields"][0]["Ok"]["type"]
         return_type_ok = ret_type_ok
-        if not(ret_type_ok in python_replacements.keys()):
+        if not(ret_type_ok in python_replacements):
             return_type_ok = prefix + ret_type_ok
         else:
             return_type_ok = python_replacements[ret_type_ok][0]
         ret_type_err = found_c["enum_fields"][1]["Err"]["type"]
         return_type_err = ret_type_err
-        if not(ret_type_err in python_replacements.keys()):
+        if not(ret_type_err in python_replacements):
             return_type_err = prefix + ret_type_err
             errlist.append(return_type_err)
         else:
@@ -2010,15 +1992,15 @@ def format_py_return(python_replacements, return_type, api_data, errlist, constr
         found_c = quick_get_class(api_data, return_type["type"])
         ret_type = found_c["enum_fields"][1]["Some"]["type"]
         return_type_opt = ret_type
-        if not(ret_type in python_replacements.keys()):
+        if not(ret_type in python_replacements):
             return_type_opt = prefix + ret_type
             ret_type_c = quick_get_class(api_data, ret_type)
-            if "enum_fields" in ret_type_c.keys():
+            if "enum_fields" in ret_type_c:
                 return_type_opt = return_type_opt + "EnumWrapper"
         else:
             return_type_opt = python_replacements[ret_type][0]
         return ("Option<" + return_type_opt + ">", return_type["type"], None)
-    elif return_type["type"] in python_replacements.keys():
+    elif return_type["type"] in python_replacements:
         return (python_replacements[return_type["type"]][0], None, None)
     else:
         # TODO: PyBuffer / Vec conversion
@@ -2027,7 +2009,7 @@ def format_py_return(python_replacements, return_type, api_data, errlist, constr
         else:
             return_type_str = prefix + return_type["type"]
             ret_type_c = quick_get_class(api_data, return_type["type"])
-            if "enum_fields" in ret_type_c.keys():
+            if "enum_fields" in ret_type_c:
                 return_type_str = return_type_str + "EnumWrapper"
             return (return_type_str, None, None)
 
@@ -2036,9 +2018,9 @@ def format_py_body(python_replacements, module_name, class_name, function_name,
     # convert input "String" into azul-internal AzStrings
     string_conversions = ""
     for f in fn_args:
-        f_name = list(f.keys())[0]
+        f_name = next(iter(f))
         f_type = f[f_name]
-        if f_type in python_replacements.keys():
+        if f_type in python_replacements:
             python_replace = python_replacements[f_type][1]
             if len(python_replacements[f_type]) == 4:
                 string_conversions += "let " + f_name + " = " + python_replacements[f_type][3] + "(&" + f_name + ");\r\n        "
@@ -2049,24 +2031,26 @@ def format_py_body(python_replacements, module_name, class_name, function_name,
 
     fn_args_invoke = ""
     for f in fn_args:
-        fn_args_invoke += "            mem::transmute(" + list(f.keys())[0] + "),\r\n"
+        fn_args_invoke += "            mem::transmute(" + next(iter(f)) + "),\r\n"
     if not(len(fn_args_invoke) == 0):
         fn_args_invoke = "\r\n" + fn_args_invoke
         fn_args_invoke += "        "
+    c_fn_name = prefix + class_name + "_" + snake_case_to_lower_camel(function_name)
+
     fn_body = ""
     fn_body += string_conversions
 
     if (not(returns_option is None)):
         # function returns option: cannot transmute, use match None { ... }
         # function throws an error: cannot transmute, use match Err { ... }
-        fn_body += "let m: " + prefix + returns_option + " = unsafe { mem::transmute(crate::" + prefix + class_name + "_" + snake_case_to_lower_camel(function_name) + "(" + fn_args_invoke + ")) };\r\n"
+        fn_body += "let m: " + prefix + returns_option + " = unsafe { mem::transmute(crate::" + c_fn_name + "(" + fn_args_invoke + ")) };\r\n"
         fn_body += "        match m {\r\n"
         fn_body += "            " + prefix + returns_option + "::Some(s) => Some("
 
         replace_option = ""
 
         # if function returns OptionString, OptionVecRefMut, ...
-        for entry in python_replacements.keys():
+        for entry in python_replacements:
             if returns_option == "Option" + entry:
                 replace_option = entry
 
@@ -2080,207 +2064,213 @@ def format_py_body(python_replacements, module_name, class_name, function_name,
         fn_body += "        }\r\n"
     elif not(returns_error is None):
         # function throws an error: cannot transmute, use match Err { ... }
-        fn_body += "let m: " + prefix + returns_error + " = unsafe { mem::transmute(crate::" + prefix + class_name + "_" + snake_case_to_lower_camel(function_name) + "(" + fn_args_invoke + ")) };\r\n"
+        fn_body += "let m: " + prefix + returns_error + " = unsafe { mem::transmute(crate::" + c_fn_name + "(" + fn_args_invoke + ")) };\r\n"
         fn_body += "        match m {\r\n"
         fn_body += "            " + prefix + returns_error + "::Ok(o) => Ok(o.into()),\r\n"
         fn_body += "            " + prefix + returns_error + "::Err(e) => Err(e.into()),\r\n"
         fn_body += "        }\r\n"
     else:
-        if return_type_str in python_replacements.keys():
-            fn_body += python_replacements[return_type_str][2] + "(unsafe { mem::transmute(crate::" + prefix + class_name + "_" + snake_case_to_lower_camel(function_name) + "(" + fn_args_invoke + ")) })"
+        if return_type_str in python_replacements:
+            fn_body += python_replacements[return_type_str][2] + "(unsafe { mem::transmute(crate::" + c_fn_name + "(" + fn_args_invoke + ")) })"
         else:
-            fn_body += "unsafe { mem::transmute(crate::" + prefix + class_name + "_" + snake_case_to_lower_camel(function_name) + "(" + fn_args_invoke + ")) }"
+            fn_body += "unsafe { mem::transmute(crate::" + c_fn_name + "(" + fn_args_invoke + ")) }"
     return fn_body
 
 
-# Generates the azul/rust/azul.rs file
-def generate_rust_api(api_data, structs_map, functions_map):
-
-    module_file_map = {}
-    version = list(api_data.keys())[-1]
-    module_file_map['dll'] = generate_rust_dll_bindings(api_data[version], structs_map, functions_map)
-    myapi_data = api_data[version]
-
-    for module_name in myapi_data.keys():
-        code = ""
-        module_doc = None
-        if "doc" in myapi_data[module_name]:
-            module_doc = myapi_data[module_name]["doc"]
+# Generates the contents of one "mod {module_name} { ... }" block of azul.rs
+#
+# modules don't depend on each other, but they are generated sequentially:
+# one module only takes a few milliseconds (see generate_api() for the process pool)
+def generate_rust_api_module(myapi_data, module_name, fn_patches):
+    code = []
+    module_doc = None
+    if "doc" in myapi_data[module_name]:
+        module_doc = myapi_data[module_name]["doc"]
 
-        module = myapi_data[module_name]["classes"]
+    module = myapi_data[module_name]["classes"]
 
-        code += "    #![allow(dead_code, unused_imports, unused_unsafe)]\r\n"
-        if module_doc != None:
-            code += "    //! " + module_doc + "\r\n"
+    code.append("    #![allow(dead_code, unused_imports, unused_unsafe)]\r\n")
+    if module_doc != None:
+        code.append(f"    //! {module_doc}\r\n")
 
-        code += "    use crate::dll::*;\r\n"
-        code += "    use core::ffi::c_void;\r\n"
+    code.append("    use crate::dll::*;\r\n")
+    code.append("    use core::ffi::c_void;\r\n")
 
-        if tuple([module_name]) in rust_api_patches:
-            code += rust_api_patches[tuple([module_name])]
+    if (module_name,) in rust_api_patches:
+        code.append(get_rust_api_patch((module_name,)))
 
-        code += get_all_imports(myapi_data, module, module_name)
+    code.append(get_all_imports(myapi_data, module, module_name))
 
-        for class_name in module.keys():
-            c = module[class_name]
+    for class_name in module:
+        c = module[class_name]
+        class_patches = fn_patches.get((module_name, class_name), {})
 
-            class_can_derive_debug = "derive" in c.keys() and "Debug" in c["derive"]
-            class_can_be_copied = "derive" in c.keys() and "Copy" in c["derive"]
-            class_has_partialeq = "derive" in c.keys() and "PartialEq" in c["derive"]
-            class_has_eq = "derive" in c.keys() and "Eq" in c["derive"]
-            class_has_partialord = "derive" in c.keys() and "PartialOrd" in c["derive"]
-            class_has_ord = "derive" in c.keys() and "Ord" in c["derive"]
-            class_can_be_hashed = "derive" in c.keys() and "Hash" in c["derive"]
+        class_is_boxed_object = not(class_is_stack_allocated(c))
+        class_is_const = "const" in c
+        class_is_callback_typedef = "callback_typedef" in c and (len(c["callback_typedef"]) > 0)
+        class_has_custom_destructor = "custom_destructor" in c and c["custom_destructor"]
+        treat_external_as_ptr = "external" in c and "is_boxed_object" in c and c["is_boxed_object"]
 
-            class_is_boxed_object = not(class_is_stack_allocated(c))
-            class_is_const = "const" in c.keys()
-            class_is_callback_typedef = "callback_typedef" in c.keys() and (len(c["callback_typedef"]) > 0)
-            class_has_custom_destructor = "custom_destructor" in c.keys() and c["custom_destructor"]
-            treat_external_as_ptr = "external" in c.keys() and "is_boxed_object" in c.keys() and c["is_boxed_object"]
+        class_can_be_cloned = True
+        if "clone" in c:
+            class_can_be_cloned = c["clone"]
 
-            class_can_be_cloned = True
-            if "clone" in c.keys():
-                class_can_be_cloned = c["clone"]
+        c_is_stack_allocated = not(class_is_boxed_object)
+        class_ptr_name = prefix + class_name
 
-            c_is_stack_allocated = not(class_is_boxed_object)
-            class_ptr_name = prefix + class_name
+        if "doc" in c:
+            code.append(f"    /// {c['doc']}\r\n    ")
+        else:
+            code.append(f"    /// `{class_name}` struct\r\n    ")
 
-            if "doc" in c.keys():
-                code += "    /// " + c["doc"] + "\r\n    "
-            else:
-                code += "    /// `" + class_name + "` struct\r\n    "
+        code.append(f"\r\n    #[doc(inline)] pub use crate::dll::{class_ptr_name} as {class_name};\r\n")
 
-            code += "\r\n    #[doc(inline)] pub use crate::dll::" + class_ptr_name + " as " + class_name + ";\r\n"
+        has_constructors = ("constructors" in c and len(c["constructors"]) > 0)
+        has_functions = ("functions" in c and len(c["functions"]) > 0)
+        has_constants = ("constants" in c and len(c["constants"]) > 0)
 
-            has_constructors = ("constructors" in c.keys() and len(c["constructors"]) > 0)
-            has_functions = ("functions" in c.keys() and len(c["functions"]) > 0)
-            has_constants = ("constants" in c.keys() and len(c["constants"]) > 0)
+        should_emit_impl = has_constructors or has_functions or has_constants and not(class_is_const or class_is_callback_typedef)
 
-            should_emit_impl = has_constructors or has_functions or has_constants and not(class_is_const or class_is_callback_typedef)
+        if should_emit_impl:
 
-            if should_emit_impl:
+            class_impl_block = ["\r\n"]
 
-                class_impl_block = "\r\n"
+            if "constants" in c:
+                for constant in c["constants"]:
+                    constant_name = next(iter(constant))
+                    constant_type = constant[constant_name]["type"]
+                    constant_value = constant[constant_name]["value"]
+                    class_impl_block.append(f"        pub const {constant_name}: {constant_type} = {constant_value};\r\n")
 
-                if "constants" in c.keys():
-                    for constant in c["constants"]:
-                        constant_name = list(constant.keys())[0]
-                        constant_type = constant[constant_name]["type"]
-                        constant_value = constant[constant_name]["value"]
-                        class_impl_block += "        pub const " + constant_name + ": " + constant_type + " = " + constant_value + ";\r\n"
+                class_impl_block.append("\r\n")
 
-                    class_impl_block += "\r\n"
+            if "constructors" in c:
+                for fn_name in c["constructors"]:
+                    const = c["constructors"][fn_name]
 
-                if "constructors" in c.keys():
-                    for fn_name in c["constructors"]:
-                        const = c["constructors"][fn_name]
+                    c_fn_name = f"{class_ptr_name}_{snake_case_to_lower_camel(fn_name)}"
+                    fn_args = rust_bindings_fn_args(const, class_name, class_ptr_name, False, myapi_data)
+                    fn_args_call = rust_bindings_call_fn_args(const, class_name, class_ptr_name, False, myapi_data, class_is_boxed_object)
 
-                        c_fn_name = class_ptr_name + "_" + snake_case_to_lower_camel(fn_name)
-                        fn_args = rust_bindings_fn_args(const, class_name, class_ptr_name, False, myapi_data)
-                        fn_args_call = rust_bindings_call_fn_args(const, class_name, class_ptr_name, False, myapi_data, class_is_boxed_object)
+                    fn_body = ""
 
-                        fn_body = ""
+                    if fn_name in class_patches \
+                    and "use_patches" in const \
+                    and "rust" in const["use_patches"]:
+                        fn_body = get_rust_api_patch(class_patches[fn_name])
+                    else:
+                        fn_body = f"unsafe {{ crate::dll::{c_fn_name}({fn_args_call}) }}"
 
-                        if tuple([module_name, class_name, fn_name]) in rust_api_patches.keys() \
-                        and "use_patches" in const.keys() \
-                        and "rust" in const["use_patches"]:
-                            fn_body = rust_api_patches[tuple([module_name, class_name, fn_name])]
-                        else:
-                            fn_body = "unsafe { crate::dll::" + c_fn_name + "(" + fn_args_call + ") }"
+                    if "doc" in const:
+                        class_impl_block.append(f"        /// {const['doc']}\r\n")
+                    else:
+                        class_impl_block.append(f"        /// Creates a new `{class_name}` instance.\r\n")
 
-                        if "doc" in const.keys():
-                            class_impl_block += "        /// " + const["doc"] + "\r\n"
+                    returns = "Self"
+                    if "returns" in const:
+                        return_type = const["returns"]["type"]
+                        returns = return_type
+                        analyzed_return_type = analyze_type(return_type)
+                        if is_primitive_arg(analyzed_return_type[1]):
+                            fn_body = fn_body
                         else:
-                            class_impl_block += "        /// Creates a new `" + class_name + "` instance.\r\n"
+                            return_type_class = search_for_class_by_class_name(myapi_data, analyzed_return_type[1])
+                            if return_type_class is None:
+                                print("no return type found for return type: " + return_type)
+                            returns = f"{analyzed_return_type[0]} crate::{return_type_class[0]}::{return_type_class[1]}{analyzed_return_type[2]}"
+                            fn_body = fn_body
 
-                        returns = "Self"
-                        if "returns" in const.keys():
-                            return_type = const["returns"]["type"]
-                            returns = return_type
-                            analyzed_return_type = analyze_type(return_type)
-                            if is_primitive_arg(analyzed_return_type[1]):
-                                fn_body = fn_body
-                            else:
-                                return_type_class = search_for_class_by_class_name(myapi_data, analyzed_return_type[1])
-                                if return_type_class is None:
-                                    print("no return type found for return type: " + return_type)
-                                returns = analyzed_return_type[0] + " crate::" + return_type_class[0] + "::" + return_type_class[1] + analyzed_return_type[2]
-                                fn_body = fn_body
+                    class_impl_block.append(f"        pub fn {fn_name}{fn_args[0]}({fn_args[1]}) -> {returns} {{ {fn_body} }}\r\n")
 
-                        class_impl_block += "        pub fn " + fn_name + "" + fn_args[0] + "(" + fn_args[1] + ") -> " + returns + " { " + fn_body + " }\r\n"
+            if "functions" in c:
+                for fn_name in c["functions"]:
+                    f = c["functions"][fn_name]
 
-                if "functions" in c.keys():
-                    for fn_name in c["functions"]:
-                        f = c["functions"][fn_name]
+                    fn_args = rust_bindings_fn_args(f, class_name, class_ptr_name, True, myapi_data)
+                    fn_args_call = rust_bindings_call_fn_args(f, class_name, class_ptr_name, True, myapi_data, class_is_boxed_object)
 
-                        fn_args = rust_bindings_fn_args(f, class_name, class_ptr_name, True, myapi_data)
-                        fn_args_call = rust_bindings_call_fn_args(f, class_name, class_ptr_name, True, myapi_data, class_is_boxed_object)
+                    c_fn_name = f"{class_ptr_name}_{snake_case_to_lower_camel(fn_name)}"
 
-                        c_fn_name = class_ptr_name + "_" + snake_case_to_lower_camel(fn_name)
+                    fn_body = ""
 
-                        fn_body = ""
+                    if fn_name in class_patches \
+                    and "use_patches" in f \
+                    and "rust" in f["use_patches"]:
+                        fn_body = get_rust_api_patch(class_patches[fn_name])
+                    else:
+                        fn_body = f"unsafe {{ crate::dll::{c_fn_name}({fn_args_call}) }}"
 
-                        if tuple([module_name, class_name, fn_name]) in rust_api_patches.keys() \
-                        and "use_patches" in const.keys() \
-                        and "rust" in const["use_patches"]:
-                            fn_body = rust_api_patches[tuple([module_name, class_name, fn_name])]
-                        else:
-                            fn_body = "unsafe { crate::dll::" + c_fn_name + "(" + fn_args_call + ") }"
+                    if fn_name in class_patches:
+                        class_impl_block.append(get_rust_api_patch(class_patches[fn_name]))
 
-                        if tuple([module_name, class_name, fn_name]) in rust_api_patches:
-                            class_impl_block += rust_api_patches[tuple([module_name, class_name, fn_name])]
+                        if "use_patches" in f and f["use_patches"]:
+                            continue
 
-                            if "use_patches" in f.keys() and f["use_patches"]:
-                                continue
+                    if "doc" in f:
+                        class_impl_block.append(f"        /// {f['doc']}\r\n")
+                    else:
+                        class_impl_block.append(f"        /// Calls the `{class_name}::{fn_name}` function.\r\n")
 
-                        if "doc" in f.keys():
-                            class_impl_block += "        /// " + f["doc"] + "\r\n"
+                    returns = ""
+                    if "returns" in f:
+                        return_type = f["returns"]["type"]
+                        returns = " -> " + return_type
+                        analyzed_return_type = analyze_type(return_type)
+                        if is_primitive_arg(analyzed_return_type[1]):
+                            fn_body = fn_body
                         else:
-                            class_impl_block += "        /// Calls the `" + class_name + "::" + fn_name + "` function.\r\n"
+                            return_type_class = search_for_class_by_class_name(myapi_data, analyzed_return_type[1])
+                            if return_type_class is None:
+                                print("no return type found for return type: " + return_type)
+                            returns = f" ->{analyzed_return_type[0]} crate::{return_type_class[0]}::{return_type_class[1]}{analyzed_return_type[2]}"
+                            fn_body = fn_body
 
-                        returns = ""
-                        if "returns" in f.keys():
-                            return_type = f["returns"]["type"]
-                            returns = " -> " + return_type
-                            analyzed_return_type = analyze_type(return_type)
-                            if is_primitive_arg(analyzed_return_type[1]):
-                                fn_body = fn_body
-                            else:
-                                return_type_class = search_for_class_by_class_name(myapi_data, analyzed_return_type[1])
-                                if return_type_class is None:
-                                    print("no return type found for return type: " + return_type)
-                                returns = " ->" + analyzed_return_type[0] + " crate::" + return_type_class[0] + "::" + return_type_class[1] + analyzed_return_type[2]
-                                fn_body = fn_body
+                    class_impl_block.append(f"        pub fn {fn_name}{fn_args[0]}({fn_args[1]}) {returns} {{ {fn_body} }}\r\n")
+
+            code.append(f"    impl {class_name} {{\r\n")
+            code.extend(class_impl_block)
+            code.append("    }\r\n\r\n") # end of class
 
-                        class_impl_block += "        pub fn " + fn_name + fn_args[0] + "(" + fn_args[1] + ") " +  returns + " { " + fn_body + " }\r\n"
+        if treat_external_as_ptr:
+            impl_args = {"name": class_name, "ptr_name": class_ptr_name}
+            if class_can_be_cloned:
+                code.append(rust_api_impl_templates["Clone"].format_map(impl_args))
+            code.append(rust_api_impl_templates["Drop"].format_map(impl_args))
 
-                code += "    impl " + class_name + " {\r\n"
-                code += class_impl_block
-                code += "    }\r\n\r\n" # end of class
+    return "".join(code)
+
+# Generates the azul/rust/azul.rs file
+def generate_rust_api(api_data, version, structs_map, functions_map):
 
-            if treat_external_as_ptr and class_can_be_cloned:
-                code += "    impl Clone for " + class_name + " { fn clone(&self) -> Self { unsafe { crate::dll::" + class_ptr_name + "_deepCopy(self) } } }\r\n"
-            if treat_external_as_ptr:
-                code += "    impl Drop for " + class_name + " { fn drop(&mut self) { if self.run_destructor { unsafe { crate::dll::" + class_ptr_name + "_delete(self) } } } }\r\n"
+    module_file_map = {}
+    module_file_map['dll'] = generate_rust_dll_bindings(api_data[version], structs_map, functions_map)
+    myapi_data = api_data[version]
 
+    # (module, class) -> {fn_name: patch key}, so generate_rust_api_module()
+    # only does a single dict lookup per function
+    fn_patches = defaultdict(dict)
+    for key in rust_api_patches:
+        if len(key) == 3:
+            fn_patches[key[:2]][key[2]] = key
 
-        module_file_map[module_name] = code
+    for module_name in myapi_data:
+        module_file_map[module_name] = generate_rust_api_module(myapi_data, module_name, fn_patches)
 
-    final_code = ""
+    final_code = []
 
-    for line in license.splitlines():
-        final_code += "// " + line + "\r\n"
+    for line in read_file(root_folder + "/LICENSE").splitlines():
+        final_code.append(f"// {line}\r\n")
 
-    final_code += read_file(root_folder + "/api/_patches/azul.rs/header.rs")
+    final_code.append(read_file(root_folder + "/api/_patches/azul.rs/header.rs"))
 
-    for module_name in module_file_map.keys():
+    for module_name in module_file_map:
         if module_name != "dll":
-            final_code += "pub "
-        final_code += "mod " + module_name + " {\r\n"
-        final_code += module_file_map[module_name]
-        final_code += "}\r\n\r\n"
+            final_code.append("pub ")
+        final_code.append(f"mod {module_name} {{\r\n")
+        final_code.append(module_file_map[module_name])
+        final_code.append("}\r\n\r\n")
 
-    return final_code
+    return "".join(final_code)
 
 # Generate the RUST function callback type:
 #
@@ -2290,21 +2280,22 @@ def generate_rust_callback_fn_type(api_data, callback_typedef):
 
     fn_string = "extern \"C\" fn("
 
-    if "fn_args" in callback_typedef.keys():
+    if "fn_args" in callback_typedef:
         fn_args = callback_typedef["fn_args"]
         for fn_arg in fn_args:
             fn_arg_type = fn_arg["type"]
-            if not "ref" in fn_arg.keys():
+            if not "ref" in fn_arg:
                 print("callback type " + str(callback_typedef) + " does not have a ref attribute for fn_arg " + str(fn_arg))
             fn_arg_ref = fn_arg["ref"]
-            search_result = search_for_class_by_class_name(api_data, fn_arg_type)
+            fn_arg_is_primitive = is_primitive_arg(fn_arg_type)
             fn_arg_class = fn_arg_type
-            if not(is_primitive_arg(fn_arg_type)):
+            if not(fn_arg_is_primitive):
+                search_result = search_for_class_by_class_name(api_data, fn_arg_type)
                 if search_result is None:
                     print("fn_arg_type " + fn_arg_type + " not found!")
                 fn_arg_class = search_result[1]
 
-            if not(is_primitive_arg(fn_arg_type)):
+            if not(fn_arg_is_primitive):
                 if fn_arg_ref == "ref":
                     fn_string += "&" + prefix + fn_arg_class
                 elif fn_arg_ref == "refmut":
@@ -2330,19 +2321,20 @@ def generate_rust_callback_fn_type(api_data, callback_typedef):
 
     fn_string += ")"
 
-    if "returns" in callback_typedef.keys():
+    if "returns" in callback_typedef:
         fn_string += " -> "
         fn_arg_type = callback_typedef["returns"]["type"]
-        search_result = search_for_class_by_class_name(api_data, fn_arg_type)
+        fn_arg_is_primitive = is_primitive_arg(fn_arg_type)
         fn_arg_class = fn_arg_type
 
-        if not(is_primitive_arg(fn_arg_type)):
+        if not(fn_arg_is_primitive):
+            search_result = search_for_class_by_class_name(api_data, fn_arg_type)
             if search_result is None:
                 print("fn_arg_type " + fn_arg_type + " not found!")
                 raise Exception("fn_arg_type " + fn_arg_type + " not found!")
             fn_arg_class = search_result[1]
 
-        if not(is_primitive_arg(fn_arg_type)):
+        if not(fn_arg_is_primitive):
             fn_string += prefix + fn_arg_class
         else:
             fn_string += fn_arg_class
@@ -2361,9 +2353,9 @@ def generate_c_structs(api_data, structs_map, forward_declarations, extra_forwar
     # C does not allow (?) to forward declare function pointers
     function_pointers = []
 
-    for struct_name in structs_map.keys():
+    for struct_name in structs_map:
         struct = structs_map[struct_name]
-        class_is_callback_typedef = "callback_typedef" in struct.keys() and (len(struct["callback_typedef"].keys()) > 0)
+        class_is_callback_typedef = "callback_typedef" in struct and (len(struct["callback_typedef"]) > 0)
         if class_is_callback_typedef:
             if typedef_style == "c":
                 function_pointers.append(tuple((struct["callback_typedef"], generate_c_callback_fn_type(api_data, struct["callback_typedef"], struct_name, use_prefix))))
@@ -2374,7 +2366,7 @@ def generate_c_structs(api_data, structs_map, forward_declarations, extra_forwar
     already_forward_declared = []
 
     for fnptr in function_pointers:
-        if "fn_args" in fnptr[0].keys():
+        if "fn_args" in fnptr[0]:
             for arg in fnptr[0]["fn_args"]:
                 arg_type = analyze_type(arg["type"])[1]
                 if is_primitive_arg(analyze_type(arg_type)[1]):
@@ -2384,7 +2376,7 @@ def generate_c_structs(api_data, structs_map, forward_declarations, extra_forwar
                     arg_type_type = "struct"
                     found_c = search_for_class_by_class_name(api_data, arg_type)
                     c = get_class(api_data, found_c[0], found_c[1])
-                    if "enum_fields" in c.keys():
+                    if "enum_fields" in c:
                         arg_type_type = "enum"
                         if enum_is_union(c["enum_fields"]):
                             arg_type_type = "union"
@@ -2394,7 +2386,7 @@ def generate_c_structs(api_data, structs_map, forward_declarations, extra_forwar
 
                     already_forward_declared.append(arg_type)
 
-        if "returns" in fnptr[0].keys():
+        if "returns" in fnptr[0]:
             return_type = fnptr[0]["returns"]["type"]
             return_type = analyze_type(return_type)[1]
             if not(is_primitive_arg(return_type)):
@@ -2403,7 +2395,7 @@ def generate_c_structs(api_data, structs_map, forward_declarations, extra_forwar
                     arg_type_type = "struct"
                     found_c = search_for_class_by_class_name(api_data, return_type)
                     c = get_class(api_data, found_c[0], found_c[1])
-                    if "enum_fields" in c.keys():
+                    if "enum_fields" in c:
                         arg_type_type = "enum"
                         if enum_is_union(c["enum_fields"]):
                             arg_type_type = "union"
@@ -2419,19 +2411,19 @@ def generate_c_structs(api_data, structs_map, forward_declarations, extra_forwar
     code += function_pointer_string
     code += "\r\n"
 
-    for struct_name in structs_map.keys():
+    for struct_name in structs_map:
         struct = structs_map[struct_name]
-        class_is_callback_typedef = "callback_typedef" in struct.keys() and (len(struct["callback_typedef"].keys()) > 0)
-        class_can_be_copied = "derive" in struct.keys() and "Copy" in struct["derive"]
-        class_has_custom_destructor = "custom_destructor" in struct.keys() and struct["custom_destructor"]
+        class_is_callback_typedef = "callback_typedef" in struct and (len(struct["callback_typedef"]) > 0)
+        class_can_be_copied = "derive" in struct and "Copy" in struct["derive"]
+        class_has_custom_destructor = "custom_destructor" in struct and struct["custom_destructor"]
         class_can_be_cloned = True
-        if "clone" in struct.keys():
+        if "clone" in struct:
             class_can_be_cloned = struct["clone"]
 
-        is_boxed_object = "is_boxed_object" in struct.keys() and struct["is_boxed_object"]
-        treat_external_as_ptr = "external" in struct.keys() and is_boxed_object
+        is_boxed_object = "is_boxed_object" in struct and struct["is_boxed_object"]
+        treat_external_as_ptr = "external" in struct and is_boxed_object
 
-        if struct_name in extra_forward_delcarations.keys():
+        if struct_name in extra_forward_delcarations:
             struct_forward_decl = extra_forward_delcarations[struct_name]
             code += "\r\n" + struct_forward_decl["type"] + " " + struct_forward_decl["name"] + ";"
             if typedef_style == "c":
@@ -2441,7 +2433,7 @@ def generate_c_structs(api_data, structs_map, forward_declarations, extra_forwar
             # function_pointers += generate_c_callback_fn_type(api_data, struct["callback_typedef"], struct_name)
             # function_pointers += "\r\n"
             pass
-        elif "struct" in struct.keys():
+        elif "struct" in struct:
             struct = struct["struct"]
             # https://stackoverflow.com/questions/65043140/how-to-forward-declare-structs-in-c
             code += "\r\nstruct " + struct_name + " {\r\n"
@@ -2449,8 +2441,8 @@ def generate_c_structs(api_data, structs_map, forward_declarations, extra_forwar
             for field in struct:
                 if type(field) is str:
                     print("Struct " + struct_name + " should have a dictionary as fields")
-                field_name = list(field.keys())[0]
-                field_type = list(field.values())[0]
+                field_name = next(iter(field))
+                field_type = next(iter(field.values()))
                 if "type" in field_type:
                     field_type = field_type["type"]
                     analyzed_arg_type = analyze_type(field_type)
@@ -2491,7 +2483,7 @@ def generate_c_structs(api_data, structs_map, forward_declarations, extra_forwar
                 if typedef_style == "c":
                     code += "typedef struct " + struct_name + " " + struct_name + ";\r\n"
 
-        elif "enum" in struct.keys():
+        elif "enum" in struct:
             enum = struct["enum"]
             if not(enum_is_union(enum)):
                 if typedef_style == "cpp":
@@ -2499,8 +2491,8 @@ def generate_c_structs(api_data, structs_map, forward_declarations, extra_forwar
                 else:
                     code += "\r\nenum " + struct_name + " {\r\n"
                 for variant in enum:
-                    variant_name = list(variant.keys())[0]
-                    variant_real = list(variant.values())[0]
+                    variant_name = next(iter(variant))
+                    variant_real = next(iter(variant.values()))
                     if typedef_style == "cpp":
                         code += "   " + variant_name + ",\r\n"
                     else:
@@ -2516,7 +2508,7 @@ def generate_c_structs(api_data, structs_map, forward_declarations, extra_forwar
                 else:
                     code += "\r\nenum " + struct_name + "Tag {\r\n"
                 for variant in enum:
-                    variant_name = list(variant.keys())[0]
+                    variant_name = next(iter(variant))
                     if typedef_style == "cpp":
                         code += "   " + variant_name + ",\r\n"
                     else:
@@ -2527,10 +2519,10 @@ def generate_c_structs(api_data, structs_map, forward_declarations, extra_forwar
 
                 # generate union variants
                 for variant in enum:
-                    variant_name = list(variant.keys())[0]
-                    variant_real = list(variant.values())[0]
+                    variant_name = next(iter(variant))
+                    variant_real = next(iter(variant.values()))
                     c_type = ""
-                    if "type" in variant_real.keys():
+                    if "type" in variant_real:
                         variant_type = variant_real["type"]
                         analyzed_variant_type = analyze_type(variant_type)
                         variant_prefix = pfx
@@ -2555,7 +2547,7 @@ def generate_c_structs(api_data, structs_map, forward_declarations, extra_forwar
                 # generate union
                 code += "\r\nunion " + struct_name + " {\r\n"
                 for variant in enum:
-                    variant_name = list(variant.keys())[0]
+                    variant_name = next(iter(variant))
                     code += "    " + struct_name + "Variant_" + variant_name + " " + variant_name + ";\r\n"
                 code += "};\r\n"
                 if not(struct_name in already_forward_declared):
@@ -2568,16 +2560,13 @@ def generate_c_structs(api_data, structs_map, forward_declarations, extra_forwar
 
 # Generate BlahVec_fromConstArray() macros and BlahVec_empty() macros
 # NOTE: This is only in the C API, the C++ API uses consteval
-def generate_c_union_macros_and_vec_constructors(api_data, structs_map):
+def generate_c_union_macros_and_vec_constructors(myapi_data, structs_map):
     code = ""
 
-    version = list(api_data.keys())[-1]
-    myapi_data = api_data[version]
-
-    for struct_name in structs_map.keys():
+    for struct_name in structs_map:
         struct = structs_map[struct_name]
 
-        if not("enum" in struct.keys()):
+        if not("enum" in struct):
             continue
 
         enum = struct["enum"]
@@ -2586,7 +2575,7 @@ def generate_c_union_macros_and_vec_constructors(api_data, structs_map):
 
         # generate macros for creating variants
         for variant in enum:
-            variant_name = list(variant.keys())[0]
+            variant_name = next(iter(variant))
             if "type" in variant[variant_name]:
                 code += "\r\n#define " + struct_name + "_" + variant_name + "(v) { ." + variant_name + " = { .tag = " + struct_name + "Tag_" + variant_name + ", .payload = v } }"
             else:
@@ -2595,8 +2584,8 @@ def generate_c_union_macros_and_vec_constructors(api_data, structs_map):
 
     # generate automatic "empty" constructor macros for all types in the "vec" module
     # for struct in api_data["0.1.0"]["classes"]["vec"]
-    if "vec" in myapi_data.keys():
-        for vec_name in myapi_data["vec"]["classes"].keys():
+    if "vec" in myapi_data:
+        for vec_name in myapi_data["vec"]["classes"]:
             if vec_name.endswith("Vec"):
                 vec_type = analyze_type(myapi_data["vec"]["classes"][vec_name]["struct_fields"][0]["ptr"]["type"])[1]
                 if is_primitive_arg(vec_type):
@@ -2614,9 +2603,9 @@ def generate_c_union_macros_and_vec_constructors(api_data, structs_map):
 def enum_is_union(enum):
     enum_is_c_enum = True
     for variant in enum:
-        variant_name = list(variant.keys())[0]
-        variant_real = list(variant.values())[0]
-        if "type" in variant_real.keys():
+        variant_name = next(iter(variant))
+        variant_real = next(iter(variant.values()))
+        if "type" in variant_real:
             enum_is_c_enum = False # enum is tagged union
     return not(enum_is_c_enum)
 
@@ -2633,7 +2622,7 @@ def generate_c_callback_fn_type(api_data, callback_typedef, callback_name,use_pr
     if not(use_prefix):
         pfx = ""
 
-    if "returns" in callback_typedef.keys():
+    if "returns" in callback_typedef:
         fn_arg_type = callback_typedef["returns"]["type"]
         search_result = search_for_class_by_class_name(api_data, fn_arg_type)
         fn_arg_class = fn_arg_type
@@ -2651,7 +2640,7 @@ def generate_c_callback_fn_type(api_data, callback_typedef, callback_name,use_pr
 
     fn_string = "typedef " + return_val + " (*" + callback_name + ")("
 
-    if "fn_args" in callback_typedef.keys():
+    if "fn_args" in callback_typedef:
         fn_args = callback_typedef["fn_args"]
         fn_arg_idx = 0
         for fn_arg in fn_args:
@@ -2708,7 +2697,7 @@ def generate_cpp_callback_fn_type(api_data, callback_typedef, callback_name,use_
     if not(use_prefix):
         pfx = ""
 
-    if "returns" in callback_typedef.keys():
+    if "returns" in callback_typedef:
         fn_arg_type = callback_typedef["returns"]["type"]
         search_result = search_for_class_by_class_name(api_data, fn_arg_type)
         fn_arg_class = fn_arg_type
@@ -2726,7 +2715,7 @@ def generate_cpp_callback_fn_type(api_data, callback_typedef, callback_name,use_
 
     fn_string = "using " + callback_name + " = " + return_val + "(*)("
 
-    if "fn_args" in callback_typedef.keys():
+    if "fn_args" in callback_typedef:
         fn_args = callback_typedef["fn_args"]
         fn_arg_idx = 0
         for fn_arg in fn_args:
@@ -2797,7 +2786,7 @@ def replace_primitive_ctype(input):
 
 # Generates the functions to put in the C header file
 # assumes that all structs / data types have already been declared previously
-def generate_c_functions(api_data,use_prefix=True,typedef_style="c"):
+def generate_c_functions(myapi_data,use_prefix=True,typedef_style="c"):
 
     code = ""
 
@@ -2809,45 +2798,41 @@ def generate_c_functions(api_data,use_prefix=True,typedef_style="c"):
     if typedef_style == "cpp":
         function_prefix = ""
 
-    version = list(api_data.keys())[-1]
-    myapi_data = api_data[version]
+    code += "\r\n\r\n/* FUNCTIONS from azul.dll / libazul.so */"
 
-    code += "\r\n"
-    code += "\r\n/* FUNCTIONS from azul.dll / libazul.so */"
-
-    for module_name in myapi_data.keys():
+    for module_name in myapi_data:
         module = myapi_data[module_name]["classes"]
-        for class_name in module.keys():
+        for class_name in module:
             c = module[class_name]
 
             c_is_stack_allocated = class_is_stack_allocated(c)
-            class_can_be_copied = "derive" in c.keys() and "Copy" in c["derive"]
+            class_can_be_copied = "derive" in c and "Copy" in c["derive"]
             class_has_recursive_destructor = has_recursive_destructor(myapi_data, c)
-            class_has_custom_destructor = "custom_destructor" in c.keys() and c["custom_destructor"]
-            is_boxed_object = "is_boxed_object" in c.keys() and c["is_boxed_object"]
-            treat_external_as_ptr = "external" in c.keys() and is_boxed_object
+            class_has_custom_destructor = "custom_destructor" in c and c["custom_destructor"]
+            is_boxed_object = "is_boxed_object" in c and c["is_boxed_object"]
+            treat_external_as_ptr = "external" in c and is_boxed_object
             class_can_be_cloned = True
-            if "clone" in c.keys():
+            if "clone" in c:
                 class_can_be_cloned = c["clone"]
 
             class_ptr_name = pfx + class_name
             print_separator = False
 
-            if "constructors" in c.keys():
+            if "constructors" in c:
                 print_separator = True
-                for constructor_name in c["constructors"].keys():
+                for constructor_name in c["constructors"]:
                     const = c["constructors"][constructor_name]
                     fn_args = c_fn_args_c_api(const, class_name, class_ptr_name, False)
                     code += "\r\n" + function_prefix + class_ptr_name + " " + class_ptr_name + "_" + snake_case_to_lower_camel(constructor_name) + "(" + fn_args + ");"
 
-            if "functions" in c.keys():
+            if "functions" in c:
                 print_separator = True
-                for function_name in c["functions"].keys():
+                for function_name in c["functions"]:
                     function = c["functions"][function_name]
                     fn_args = c_fn_args_c_api(function, class_name, class_ptr_name, True)
 
                     return_val = "void"
-                    if "returns" in function.keys():
+                    if "returns" in function:
                         analyzed_return_type = analyze_type(function["returns"]["type"])
                         if is_primitive_arg(analyzed_return_type[1]):
                             return_val = replace_primitive_ctype(analyzed_return_type[1])
@@ -2874,23 +2859,19 @@ def generate_c_functions(api_data,use_prefix=True,typedef_style="c"):
     return code
 
 # Generates all constants
-def generate_c_constants(api_data):
-
-    version = list(api_data.keys())[-1]
-    myapi_data = api_data[version]
+def generate_c_constants(myapi_data):
 
     code = ""
-    code += "\r\n"
-    code += "\r\n/* CONSTANTS */\r\n\r\n"
+    code += "\r\n\r\n/* CONSTANTS */\r\n\r\n"
 
-    for module_name in myapi_data.keys():
+    for module_name in myapi_data:
         module = myapi_data[module_name]["classes"]
-        for class_name in module.keys():
+        for class_name in module:
             c = module[class_name]
 
-            if "constants" in c.keys():
+            if "constants" in c:
                 for constant in c["constants"]:
-                    constant_name = list(constant.keys())[0]
+                    constant_name = next(iter(constant))
                     constant_type = constant[constant_name]["type"]
                     constant_value = constant[constant_name]["value"]
                     code += "#define " + prefix + class_name + "_" + constant_name + " " + constant_value + "\r\n"
@@ -2899,20 +2880,17 @@ def generate_c_constants(api_data):
     return code
 
 # Generates extra functions for C to destructure tagged union enums
-def generate_c_extra_functions(api_data):
-
-    version = list(api_data.keys())[-1]
-    myapi_data = api_data[version]
+def generate_c_extra_functions(myapi_data):
 
     code = ""
 
-    for module_name in myapi_data.keys():
+    for module_name in myapi_data:
         module = myapi_data[module_name]["classes"]
-        for class_name in module.keys():
+        for class_name in module:
             c = module[class_name]
             e = False
 
-            if "enum_fields" in c.keys():
+            if "enum_fields" in c:
                 if enum_is_union(c["enum_fields"]):
                     e = True
 
@@ -2921,7 +2899,7 @@ def generate_c_extra_functions(api_data):
 
             # generate _matchRef and _matchMut functions for each variant in the enum
             for variant in c["enum_fields"]:
-                variant_name = list(variant.keys())[0]
+                variant_name = next(iter(variant))
                 if "type" in variant[variant_name]:
                     type_name = variant[variant_name]["type"]
 
@@ -2941,10 +2919,9 @@ def generate_c_extra_functions(api_data):
 
     return code
 
-def generate_c_api(api_data, structs_map):
+def generate_c_api(api_data, version, structs_map):
     code = ""
 
-    version = list(api_data.keys())[-1]
     myapi_data = api_data[version]
 
     structs_map = sort_structs_map(myapi_data, structs_map)
@@ -2953,13 +2930,11 @@ def generate_c_api(api_data, structs_map):
     structs_map = structs_map[0]
 
     code += "#ifndef AZUL_H\r\n"
-    code += "#define AZUL_H\r\n"
-    code += "\r\n"
+    code += "#define AZUL_H\r\n\r\n"
     code += "#include <stdbool.h>\r\n" # bool
     code += "#include <stdint.h>\r\n" # uint8_t, ...
     code += "#include <stddef.h>\r\n" # size_t
-    code += "\r\n"
-    code += "/* C89 port for \"restrict\" keyword from C99 */\r\n"
+    code += "\r\n/* C89 port for \"restrict\" keyword from C99 */\r\n"
     code += "#if __STDC__ != 1\r\n"
     code += "#    define restrict __restrict\r\n"
     code += "#else\r\n"
@@ -2970,8 +2945,7 @@ def generate_c_api(api_data, structs_map):
     code += "#            define restrict __restrict\r\n"
     code += "#        endif\r\n"
     code += "#    endif\r\n"
-    code += "#endif\r\n"
-    code += "\r\n"
+    code += "#endif\r\n\r\n"
     code += "/* cross-platform define for ssize_t (signed size_t) */\r\n"
     code += "#ifdef _WIN32\r\n"
     code += "    #include <windows.h>\r\n"
@@ -2980,32 +2954,28 @@ def generate_c_api(api_data, structs_map):
     code += "    #endif\r\n"
     code += "#else\r\n"
     code += "    #include <sys/types.h>\r\n"
-    code += "#endif\r\n"
-    code += "\r\n"
+    code += "#endif\r\n\r\n"
     code += "/* cross-platform define for __declspec(dllimport) */\r\n"
     code += "#ifdef _WIN32\r\n"
     code += "    #define DLLIMPORT __declspec(dllimport)\r\n"
     code += "#else\r\n"
     code += "    #define DLLIMPORT\r\n"
-    code += "#endif\r\n"
-    code += "\r\n"
+    code += "#endif\r\n\r\n"
 
     code += generate_c_structs(myapi_data, structs_map, forward_delcarations, extra_forward_delcarations)
-    code += generate_c_union_macros_and_vec_constructors(api_data, structs_map)
-    code += generate_c_functions(api_data)
-    code += generate_c_constants(api_data)
-    code += generate_c_extra_functions(api_data)
+    code += generate_c_union_macros_and_vec_constructors(myapi_data, structs_map)
+    code += generate_c_functions(myapi_data)
+    code += generate_c_constants(myapi_data)
+    code += generate_c_extra_functions(myapi_data)
 
     code += "\r\n"
     code += read_file(root_folder + "/api/_patches/c/patch.h")
-    code += "\r\n"
-    code += "\r\n#endif /* AZUL_H */\r\n"
+    code += "\r\n\r\n#endif /* AZUL_H */\r\n"
     return code
 
-def generate_cpp_api(api_data, structs_map):
+def generate_cpp_api(api_data, version, structs_map):
     code = ""
 
-    version = list(api_data.keys())[-1]
     myapi_data = api_data[version]
 
     structs_map = sort_structs_map(myapi_data, structs_map)
@@ -3014,10 +2984,8 @@ def generate_cpp_api(api_data, structs_map):
     structs_map = structs_map[0]
 
     code += "#ifndef AZUL_H\r\n"
-    code += "#define AZUL_H\r\n"
-    code += "\r\n"
-    code += "namespace dll {\r\n"
-    code += "\r\n"
+    code += "#define AZUL_H\r\n\r\n"
+    code += "namespace dll {\r\n\r\n"
     code += "    #include <cstdint>\r\n" # uint8_t, ...
     code += "    #include <cstddef>\r\n" # size_t
 
@@ -3036,18 +3004,15 @@ def generate_cpp_api(api_data, structs_map):
     code += "\r\n"
 
     code += "    extern \"C\" {"
-    c_functions_code = generate_c_functions(api_data,use_prefix=False,typedef_style="cpp")
+    c_functions_code = generate_c_functions(myapi_data,use_prefix=False,typedef_style="cpp")
     for line in c_functions_code.splitlines():
         code += "        " + line + "\r\n"
-    code += "\r\n"
-    code += "    } /* extern \"C\" */\r\n"
-    code += "\r\n"
+    code += "\r\n    } /* extern \"C\" */\r\n\r\n"
 
     code += "} /* namespace */ \r\n"
 
 
-    code += "\r\n"
-    code += "\r\n#endif /* AZUL_H */\r\n"
+    code += "\r\n\r\n#endif /* AZUL_H */\r\n"
 
     return code
 
@@ -3055,20 +3020,20 @@ def strip_all_prefixes(structs_map, forward_delcarations, extra_forward_delcarat
 
     # strip structs_map
     new_structs_map = OrderedDict({})
-    for key in structs_map.keys():
+    for key in structs_map:
         value = structs_map[key]
         key = key[len(prefix):]
         new_structs_map[key] = value
 
     # strip forward_delcarations
     new_forward_delcarations = OrderedDict({})
-    for key in forward_delcarations.keys():
+    for key in forward_delcarations:
         value = forward_delcarations[key]
         key = key[len(prefix):]
         new_forward_delcarations[key] = value
 
     new_extra_forward_delcarations = OrderedDict({})
-    for key in extra_forward_delcarations.keys():
+    for key in extra_forward_delcarations:
         value = extra_forward_delcarations[key]
         key = key[len(prefix):]
         new_extra_forward_delcarations[key] = value
@@ -3081,32 +3046,31 @@ def generate_size_test(api_data, structs_map):
 
     generated_structs = generate_structs(api_data, structs_map, False)
 
-    test_str = ""
+    test_str = []
 
-    test_str += "#[cfg(all(test, not(feature = \"rlib\")))]\r\n"
-    test_str += "#[allow(dead_code)]\r\n"
-    test_str += "mod test_sizes {\r\n"
+    test_str.append("#[cfg(all(test, not(feature = \"rlib\")))]\r\n")
+    test_str.append("#[allow(dead_code)]\r\n")
+    test_str.append("mod test_sizes {\r\n")
 
-    test_str += read_file(root_folder + "/api/_patches/azul-dll/test-sizes.rs")
+    test_str.append(read_file(root_folder + "/api/_patches/azul-dll/test-sizes.rs"))
 
-    test_str += generated_structs
-    test_str += "    use core::ffi::c_void;\r\n"
-    test_str += "    use azul_impl::css::*;\r\n"
-    test_str += "\r\n"
+    test_str.append(generated_structs)
+    test_str.append("    use core::ffi::c_void;\r\n")
+    test_str.append("    use azul_impl::css::*;\r\n\r\n")
 
-    test_str += "    #[test]\r\n"
-    test_str += "    fn test_size() {\r\n"
-    test_str += "         use core::alloc::Layout;\r\n"
+    test_str.append("    #[test]\r\n")
+    test_str.append("    fn test_size() {\r\n")
+    test_str.append("         use core::alloc::Layout;\r\n")
 
-    for struct_name in structs_map.keys():
+    for struct_name in structs_map:
         struct = structs_map[struct_name]
-        if "external" in struct.keys():
+        if "external" in struct:
             external_path = struct["external"]
-            test_str += "        assert_eq!((Layout::new::<" + external_path + ">(), \"" + struct_name +  "\"), (Layout::new::<" + struct_name + ">(), \"" + struct_name +  "\"));\r\n"
+            test_str.append("        assert_eq!((Layout::new::<" + external_path + ">(), \"" + struct_name +  "\"), (Layout::new::<" + struct_name + ">(), \"" + struct_name +  "\"));\r\n")
 
-    test_str += "    }\r\n"
-    test_str += "}\r\n"
-    return test_str
+    test_str.append("    }\r\n")
+    test_str.append("}\r\n")
+    return "".join(test_str)
 
 # ---------------------------
 
@@ -3135,19 +3099,47 @@ def cleanup_start():
     #     if os.path.exists(os.environ['AZUL_INSTALL_DIR']):
     #         remove_path(os.environ['AZUL_INSTALL_DIR'])
 
-def generate_api():
+# The generators after generate_rust_dll() are independent of each other and can run
+# in a process pool (AZUL_PARALLEL_CODEGEN=1), but each one only takes a few 10ms, so
+# the pool startup and pickling apiData / structs_map for every worker usually costs
+# more than it saves - by default (and always on single-core machines) they run serially
+def generate_api(parallel=False):
     apiData = read_api_file(root_folder + "/api.json")
-    rust_dll_result = generate_rust_dll(apiData)
+    # all generators target the newest API version (last key in api.json)
+    version = next(reversed(apiData))
+    rust_dll_result = generate_rust_dll(apiData, version)
 
     structs_map = rust_dll_result[1].copy()
     functions_map = rust_dll_result[2]
     forward_declarations = rust_dll_result[3]
 
-    write_file(rust_dll_result[0], root_folder + "/azul-dll/src/lib.rs")
-    write_file(generate_rust_api(apiData, structs_map, functions_map.copy()), root_folder + "/api/rust/src/lib.rs")
-    write_file(generate_c_api(apiData, structs_map), root_folder + "/api/c/azul.h")
-    write_file(generate_python_api(apiData, structs_map, functions_map.copy()), root_folder + "/azul-dll/src/python.rs")
-    write_file(generate_cpp_api(apiData, structs_map), root_folder + "/api/cpp/azul.hpp")
+    # (path, contents) of all generated files, written out once everything
+    # is generated, so a failing generator doesn't leave half-updated sources
+    output_files = [(root_folder + "/azul-dll/src/lib.rs", rust_dll_result[0])]
+
+    # the other generators only depend on the azul-dll results
+    targets = [
+        (generate_rust_api, (apiData, version, structs_map, functions_map.copy()), root_folder + "/api/rust/src/lib.rs"),
+        (generate_c_api, (apiData, version, structs_map), root_folder + "/api/c/azul.h"),
+        (generate_python_api, (apiData, version, structs_map, functions_map.copy()), root_folder + "/azul-dll/src/python.rs"),
+        (generate_cpp_api, (apiData, version, structs_map), root_folder + "/api/cpp/azul.hpp"),
+    ]
+
+    if parallel and (os.cpu_count() or 1) > 1:
+        with ProcessPoolExecutor(max_workers=len(targets)) as executor:
+            futures = []
+            for (generator, args, path) in targets:
+                futures.append((path, executor.submit(generator, *args)))
+            for (path, future) in futures:
+                output_files.append((path, future.result()))
+    else:
+        for (generator, args, path) in targets:
+            output_files.append((path, generator(*args)))
+
+    for (path, contents) in output_files:
+        write_file(contents, path)
+
+    clear_class_index_cache()
 
 # Build the library with release settings
 def build_dll():
@@ -3541,36 +3533,36 @@ def generate_docs():
         api_page_contents += api_header
         api_page_contents += "<ul>"
 
-        if "doc" in apiData[version].keys():
+        if "doc" in apiData[version]:
             api_page_contents += "<p class=\"version doc\">" + format_doc(apiData[version]["doc"]) + "</p>"
 
-        for module_name in apiData[version].keys():
+        for module_name in apiData[version]:
 
             api_page_contents += "<li class=\"m\" id=\"m." + module_name + "\">"
 
             module = apiData[version][module_name]
 
-            if "doc" in module.keys():
+            if "doc" in module:
                 api_page_contents += "<p class=\"m doc\">" + format_doc(module["doc"]) + "</p>"
 
             api_page_contents += "<h3>mod <a href=\"#m." + module_name + "\">" + module_name + "</a>:</h3>"
 
             api_page_contents += "<ul>"
 
-            for class_name in module["classes"].keys():
+            for class_name in module["classes"]:
                 c = module["classes"][class_name]
-                is_boxed_object = "is_boxed_object" in c.keys() and c["is_boxed_object"]
-                treat_external_as_ptr = "external" in c.keys() and is_boxed_object
-                class_has_custom_destructor = "custom_destructor" in c.keys() and c["custom_destructor"]
+                is_boxed_object = "is_boxed_object" in c and c["is_boxed_object"]
+                treat_external_as_ptr = "external" in c and is_boxed_object
+                class_has_custom_destructor = "custom_destructor" in c and c["custom_destructor"]
                 class_has_recursive_destructor = has_recursive_destructor(apiData[version], c)
 
                 destructor_warning = ""
                 if class_has_custom_destructor or treat_external_as_ptr or class_has_recursive_destructor:
                     destructor_warning = "&nbsp;<span class=\"chd\">has destructor</span>"
 
-                if "enum_fields" in c.keys():
+                if "enum_fields" in c:
                     api_page_contents += "<li class=\"st e pbi\" id=\"st." + class_name + "\">"
-                    if "doc" in c.keys():
+                    if "doc" in c:
                         api_page_contents += "<p class=\"class doc\">" + format_doc(c["doc"]) + "</p>"
                     enum_type = "enum"
                     if enum_is_union(c["enum_fields"]):
@@ -3578,7 +3570,7 @@ def generate_docs():
 
                     api_page_contents += "<h4>" + enum_type + " <a href=\"#st." + class_name + "\">" + class_name + "</a>" + destructor_warning + "</h4>"
                     for enum_variant in c["enum_fields"]:
-                        enum_variant_name = list(enum_variant.keys())[0]
+                        enum_variant_name = next(iter(enum_variant))
                         if "doc" in enum_variant[enum_variant_name]:
                             api_page_contents += "<p class=\"v doc\">" + format_doc(enum_variant[enum_variant_name]["doc"]) + "</p>"
 
@@ -3593,13 +3585,13 @@ def generate_docs():
                         else:
                             api_page_contents += "<p class=\"f\">" + enum_variant_name + "</p>"
 
-                elif "struct_fields" in c.keys():
+                elif "struct_fields" in c:
                     api_page_contents += "<li class=\"st s pbi\" id=\"st." + class_name + "\">"
-                    if "doc" in c.keys():
+                    if "doc" in c:
                         api_page_contents += "<p class=\"class doc\">" + format_doc(c["doc"]) + "</p>"
                     api_page_contents += "<h4>struct <a href=\"#st." + class_name + "\">" + class_name + "</a>" + destructor_warning + "</h4>"
                     for struct_field in c["struct_fields"]:
-                        struct_field_name = list(struct_field.keys())[0]
+                        struct_field_name = next(iter(struct_field))
                         struct_type = struct_field[struct_field_name]["type"]
                         analyzed_struct_type = analyze_type(struct_type)
 
@@ -3611,9 +3603,9 @@ def generate_docs():
                         else:
                             api_page_contents += "<p class=\"f\">" + struct_field_name + ": " + analyzed_struct_type[0] + "<a href=\"#st." + analyzed_struct_type[1] + "\">" + analyzed_struct_type[1] +"</a>" + analyzed_struct_type[2] + "</p>"
 
-                elif "callback_typedef" in c.keys():
+                elif "callback_typedef" in c:
                     api_page_contents += "<li class=\"pbi fnty\" id=\"st." + class_name + "\">"
-                    if "doc" in c.keys():
+                    if "doc" in c:
                         api_page_contents += "<p class=\"class doc\">" + format_doc(c["doc"]) + "</p>"
                     api_page_contents += "<h4>fnptr <a href=\"#fnty." + class_name + "\">" + class_name + "</a></h4>"
                     callback_typedef = c["callback_typedef"]
@@ -3622,7 +3614,7 @@ def generate_docs():
                         api_page_contents += "<ul>"
                         for fn_arg in callback_typedef["fn_args"]:
 
-                            if "doc" in fn_arg.keys():
+                            if "doc" in fn_arg:
                                 api_page_contents += "<p class=\"arg doc\">" + format_doc(fn_arg["doc"]) + "</p>"
 
                             fn_arg_type = fn_arg["type"]
@@ -3643,8 +3635,8 @@ def generate_docs():
                                 api_page_contents += "<li><p class=\"fnty arg\">arg " + fn_arg_ref_html + " <a href=\"#st." + analyzed_fn_arg_type[1] + "\">" + fn_arg_type + "</a></p></li>"
                         api_page_contents += "</ul>"
 
-                    if "returns" in callback_typedef.keys():
-                        if "doc" in callback_typedef["returns"].keys():
+                    if "returns" in callback_typedef:
+                        if "doc" in callback_typedef["returns"]:
                             api_page_contents += "<p class=\"ret doc\">" + format_doc(callback_typedef["returns"]["doc"]) + "</p>"
                         return_type = callback_typedef["returns"]["type"]
                         analyzed_return_type = analyze_type(return_type)
@@ -3653,7 +3645,7 @@ def generate_docs():
                         else:
                             api_page_contents += "<p class=\"fnty ret\">-&gt;&nbsp;<a href=\"#st." + analyzed_return_type[1] + "\">" + analyzed_return_type[1] + "</a></p>"
 
-                if "constructors" in c.keys():
+                if "constructors" in c:
                     api_page_contents += "<ul>"
                     for function_name in c["constructors"]:
                         f = c["constructors"][function_name]
@@ -3663,9 +3655,9 @@ def generate_docs():
                         if "fn_args" in f:
                             args = f["fn_args"]
                             for arg in args:
-                                arg_name = list(arg.keys())[0]
+                                arg_name = next(iter(arg))
                                 arg_val = arg[arg_name]
-                                if "doc" in arg.keys():
+                                if "doc" in arg:
                                     arg_string += "<p class=\"arg doc\">" + arg["doc"] + "</p>"
 
                                 analyzed_arg_val = analyze_type(arg_val)
@@ -3679,9 +3671,9 @@ def generate_docs():
                         api_page_contents += "<ul>"
                         if not(len(arg_string) == 0):
                             api_page_contents += arg_string
-                        if "returns" in f.keys():
+                        if "returns" in f:
                             api_page_contents += "<li>"
-                            if "doc" in f["returns"].keys():
+                            if "doc" in f["returns"]:
                                 api_page_contents += "<p class=\"ret doc\">" + format_doc(f["returns"]["doc"]) + "</p>"
                             return_type = f["returns"]["type"]
                             analyzed_return_type = analyze_type(return_type)
@@ -3697,7 +3689,7 @@ def generate_docs():
 
                     api_page_contents += "</ul>"
 
-                if "functions" in c.keys():
+                if "functions" in c:
                     api_page_contents += "<ul>"
                     for function_name in c["functions"]:
                         f = c["functions"][function_name]
@@ -3708,7 +3700,7 @@ def generate_docs():
                         if "fn_args" in f:
                             args = f["fn_args"]
                             for arg in args:
-                                arg_name = list(arg.keys())[0]
+                                arg_name = next(iter(arg))
                                 arg_val = arg[arg_name]
 
                                 if arg_name == "self":
@@ -3719,7 +3711,7 @@ def generate_docs():
                                     elif arg_val == "refmut":
                                         self_arg = "&mut self"
                                 else:
-                                    if "doc" in arg.keys():
+                                    if "doc" in arg:
                                         arg_string += "<p class=\"arg doc\">" + arg["doc"] + "</p>"
 
                                     analyzed_arg_val = analyze_type(arg_val)
@@ -3734,9 +3726,9 @@ def generate_docs():
                         api_page_contents += "<li><p class=\"arg\">" + self_arg + "</p></li>"
                         if not(len(arg_string) == 0):
                             api_page_contents += arg_string
-                        if "returns" in f.keys():
+                        if "returns" in f:
                             api_page_contents += "<li>"
-                            if "doc" in f["returns"].keys():
+                            if "doc" in f["returns"]:
                                 api_page_contents += "<p class=\"ret doc\">" + format_doc(f["returns"]["doc"]) + "</p>"
                             return_type = f["returns"]["type"]
                             analyzed_return_type = analyze_type(return_type)
@@ -3800,6 +3792,8 @@ def generate_docs():
     api_combined_page = api_combined_page.replace("$$CONTENT$$", api_sidebar_string)
     write_file(api_combined_page, root_folder + "/target/html/api.html")
 
+    clear_class_index_cache()
+
 def build_azulc():
     # enable features="image_loading, font_loading" to enable layouting
     os.system('cd "' + root_folder + '/azulc" && cargo build --bin azulc --no-default-features --features="xml std font_loading image_loading text_layout" --release')
@@ -3876,7 +3870,7 @@ def format_license_authors(license_json):
         authors = []
         for author in a.split("|"):
             # strip email for privacy reasons
-            authors.append(re.sub("<.*>", "", author).strip())
+            authors.append(author_email_regex.sub("", author).strip())
 
         license_txt += name + " v" + version + " licensed " + license + "\r\n    by " + ", ".join(authors) + "\r\n"
 
@@ -3956,7 +3950,7 @@ def main():
     # print("verifying that LLVM / clang-cl is installed...")
     # verify_clang_is_installed()
     print("generating API...")
-    generate_api()
+    generate_api(parallel=os.environ.get('AZUL_PARALLEL_CODEGEN', '') == '1')
     print("generating documentation in /target/html...")
     generate_docs()
     print("building azulc (release mode)...")